@@ -3,7 +3,7 @@
 Generate cover and body images for blog index.md files via GPUGeek API.
 
 Usage:
-  python3 generate_images.py <blog_dir> [--cover-only] [--body-only] [--output-dir <dir>]
+  python3 generate_images.py <blog_dir> [--cover-only] [--body-only] [--output-dir <dir>] [--no-cache]
 
 Arguments:
   blog_dir      Directory containing blog folders with index.md files.
@@ -11,20 +11,33 @@ Arguments:
   --cover-only  Only generate cover images
   --body-only   Only generate body images
   --output-dir  Output directory for images (default: <blog_dir>/generated_images)
+  --no-cache    Call the API even when ~/.cache/blog_image_gen has an image for the same prompt
 
 Naming: -{url_slug}-cover-image.png / -{url_slug}-body-image.png
 """
 
+import aiohttp
 import argparse
+import asyncio
 import base64
+import hashlib
 import os
+import random
 import re
-import requests
+import shutil
 import sys
 import time
 
 GPUGEEK_API_KEY = os.environ.get("GPUGEEK_API_KEY", "30ggn31053e5tv01000dfounia0yeza340exi1ks")
 API_URL = "https://api.gpugeek.com/predictions"
+MAX_CONCURRENCY = 8  # images in flight at once
+REQUEST_SPACING = 3  # seconds between API submissions, to avoid rate limits
+POLL_TIMEOUT = 300  # seconds to wait for an async prediction
+POLL_MAX_DELAY = 10.0
+MODEL = "Vendor2/Gemini-3-Pro-Image"
+ASPECT_RATIO = "16:9"
+IMAGE_SIZE = "1K"
+CACHE_DIR = os.path.expanduser("~/.cache/blog_image_gen")
 
 COVER_IMAGE_PROMPT = r"""
 # Paper Cover Illustrator
@@ -103,37 +116,51 @@ Paper content:
 """
 
 
-def generate_image(summary_text, prompt_type):
+def build_prompt(summary_text, prompt_type):
     template = COVER_IMAGE_PROMPT if prompt_type == "cover" else BODY_IMAGE_PROMPT
-    prompt = template.format(summary_text=summary_text)
+    return template.format(summary_text=summary_text)
 
+
+def cache_path(prompt):
+    """Cache file for a prompt; the key covers every input that changes the image."""
+    key = hashlib.sha256("\0".join([prompt, MODEL, ASPECT_RATIO, IMAGE_SIZE]).encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, key + ".png")
+
+
+async def generate_image(session, prompt, label=""):
     headers = {
         "Authorization": "Bearer " + GPUGEEK_API_KEY,
         "Content-Type": "application/json",
     }
     data = {
-        "model": "Vendor2/Gemini-3-Pro-Image",
+        "model": MODEL,
         "input": {
-            "aspectRatio": "16:9",
-            "imageSize": "1K",
+            "aspectRatio": ASPECT_RATIO,
+            "imageSize": IMAGE_SIZE,
             "images": [],
             "prompt": prompt,
         },
     }
 
-    resp = requests.post(API_URL, headers=headers, json=data, timeout=180)
-    result = resp.json()
+    async with session.post(API_URL, headers=headers, json=data,
+                            timeout=aiohttp.ClientTimeout(total=180)) as resp:
+        result = await resp.json(content_type=None)
 
     if result.get("status") in ("starting", "processing") and result.get("id"):
         pred_id = result["id"]
-        print("    Polling async prediction...", flush=True)
-        for _ in range(60):
-            time.sleep(5)
-            poll = requests.get(
+        print("    %sPolling async prediction..." % label, flush=True)
+        # Exponential backoff with +/-20% jitter: 1s, 1.5s, 2.25s, ... capped at 10s
+        deadline = time.monotonic() + POLL_TIMEOUT
+        delay = 1.0
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay * (0.8 + 0.4 * random.random()))
+            delay = min(delay * 1.5, POLL_MAX_DELAY)
+            async with session.get(
                 API_URL + "/" + pred_id,
                 headers={"Authorization": "Bearer " + GPUGEEK_API_KEY},
-                timeout=30,
-            ).json()
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as resp:
+                poll = await resp.json(content_type=None)
             if poll.get("status") == "succeeded":
                 return poll.get("output")
             if poll.get("status") == "failed":
@@ -157,24 +184,56 @@ def decode_and_save(image_data, output_path):
     return True
 
 
-def get_field(index_path, field):
-    with open(index_path, "r") as f:
-        for line in f:
-            if line.strip().startswith(field + ":"):
-                m = re.search(r'"([^"]*)"', line)
-                return m.group(1) if m else ""
-    return None
+async def download_image(session, url, output_path):
+    """Stream an image URL to disk without holding the whole body in memory."""
+    tmp_path = output_path + ".part"
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as resp:
+            resp.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    f.write(chunk)
+    except BaseException:
+        # Don't leave a partial .part next to the blog images
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    # Rename only once complete so a broken download is never mistaken for a finished image
+    os.replace(tmp_path, output_path)
+    return True
 
 
-def needs_cover(index_path):
-    val = get_field(index_path, "image")
-    return val is not None and val.strip() == ""
+async def save_output(session, image_data, output_path):
+    """Save the API output, fetching it directly when it is a URL and decoding base64 otherwise."""
+    if isinstance(image_data, list):
+        image_data = image_data[0] if image_data else None
+    if isinstance(image_data, str) and image_data.startswith(("http://", "https://")):
+        return await download_image(session, image_data, output_path)
+    return decode_and_save(image_data, output_path)
+
 
+_INDEX_FIELD_RE = re.compile(r'^\s*(image|url_slug):(?:[^"]*"([^"]*)")?')
 
-def needs_body(index_path):
+
+def scan_index(index_path):
+    """Read index.md once and pull out everything main() needs.
+
+    Returns {"url_slug", "image", "needs_body"}; a field is None when the
+    front matter lacks it and "" when it has no quoted value.
+    """
     with open(index_path, "r") as f:
         content = f.read()
-    return "](body_image_url)" in content
+    fields = {"url_slug": None, "image": None}
+    for line in content.splitlines():
+        m = _INDEX_FIELD_RE.match(line)
+        if m and fields[m.group(1)] is None:
+            fields[m.group(1)] = m.group(2) or ""
+            if fields["url_slug"] is not None and fields["image"] is not None:
+                break
+    fields["needs_body"] = "](body_image_url)" in content
+    return fields
 
 
 def find_blogs(blog_dir):
@@ -183,19 +242,81 @@ def find_blogs(blog_dir):
     if os.path.isfile(index):
         return [blog_dir]
     folders = []
-    for name in sorted(os.listdir(blog_dir)):
-        idx = os.path.join(blog_dir, name, "index.md")
-        if os.path.isfile(idx):
-            folders.append(os.path.join(blog_dir, name))
+    with os.scandir(blog_dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        # DirEntry caches the type, so plain files cost no extra stat
+        if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "index.md")):
+            folders.append(entry.path)
     return folders
 
 
+async def process_task(session, sem, spacing, task, i, total, output_dir, use_cache=True):
+    folder, index_path, slug, ptype = task
+    filename = "-%s-%s-image.png" % (slug, ptype)
+    filepath = os.path.join(output_dir, filename)
+
+    if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
+        kb = os.path.getsize(filepath) / 1024
+        print("[%d/%d] SKIP %s (%.0f KB exists)" % (i, total, filename, kb), flush=True)
+        return True
+
+    # Only the head of index.md goes into the prompt; don't read the rest
+    with open(index_path, "r") as f:
+        content = f.read(2000)
+    prompt = build_prompt(content, ptype)
+
+    # Same prompt as an earlier run (any blog, any checkout): reuse that image
+    cached = cache_path(prompt)
+    if use_cache and os.path.isfile(cached):
+        shutil.copyfile(cached, filepath)
+        print("[%d/%d] CACHED %s" % (i, total, filename), flush=True)
+        return True
+
+    async with sem:
+        # Hold the lock while sleeping so submissions stay REQUEST_SPACING apart
+        async with spacing:
+            await asyncio.sleep(REQUEST_SPACING)
+        print("[%d/%d] %s | %s" % (i, total, ptype.upper(), slug), flush=True)
+        try:
+            output = await generate_image(session, prompt, label="[%d/%d] " % (i, total))
+            if await save_output(session, output, filepath):
+                kb = os.path.getsize(filepath) / 1024
+                try:
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    shutil.copyfile(filepath, cached)
+                except OSError:
+                    pass
+                print("  [%d/%d] OK %s (%.0f KB)" % (i, total, filename, kb), flush=True)
+                return True
+            print("  [%d/%d] FAIL empty API response" % (i, total), flush=True)
+        except Exception as e:
+            print("  [%d/%d] FAIL %s" % (i, total, e), flush=True)
+    return False
+
+
+async def run_tasks(tasks, output_dir, use_cache=True):
+    """Run all generation tasks concurrently; returns the number that succeeded."""
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    spacing = asyncio.Lock()
+    async with aiohttp.ClientSession() as session:
+        coros = [process_task(session, sem, spacing, t, i, len(tasks), output_dir, use_cache)
+                 for i, t in enumerate(tasks, 1)]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+    # Errors outside process_task's API try (index read, cache copy) land here
+    for i, (t, r) in enumerate(zip(tasks, results), 1):
+        if isinstance(r, BaseException):
+            print("  [%d/%d] FAIL %s %s: %s" % (i, len(tasks), t[3], t[2], r), flush=True)
+    return sum(1 for r in results if r is True)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate blog cover/body images")
     parser.add_argument("blog_dir", help="Blog directory or parent directory")
     parser.add_argument("--cover-only", action="store_true")
     parser.add_argument("--body-only", action="store_true")
     parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--no-cache", action="store_true", help="Ignore images cached from earlier runs")
     args = parser.parse_args()
 
     blog_dir = os.path.abspath(args.blog_dir)
@@ -210,13 +331,15 @@ def main():
     tasks = []
     for folder in folders:
         index_path = os.path.join(folder, "index.md")
-        slug = get_field(index_path, "url_slug")
+        info = scan_index(index_path)
+        slug = info["url_slug"]
         if not slug:
             continue
 
-        if not args.body_only and needs_cover(index_path):
+        image = info["image"]
+        if not args.body_only and image is not None and image.strip() == "":
             tasks.append((folder, index_path, slug, "cover"))
-        if not args.cover_only and needs_body(index_path):
+        if not args.cover_only and info["needs_body"]:
             tasks.append((folder, index_path, slug, "body"))
 
     if not tasks:
@@ -228,36 +351,7 @@ def main():
         print("  %s: %s" % (ptype.upper(), slug))
     print()
 
-    ok = 0
-    for i, (folder, index_path, slug, ptype) in enumerate(tasks, 1):
-        filename = "-%s-%s-image.png" % (slug, ptype)
-        filepath = os.path.join(output_dir, filename)
-
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            kb = os.path.getsize(filepath) / 1024
-            print("[%d/%d] SKIP %s (%.0f KB exists)" % (i, len(tasks), filename, kb), flush=True)
-            ok += 1
-            continue
-
-        print("[%d/%d] %s | %s" % (i, len(tasks), ptype.upper(), slug), flush=True)
-
-        with open(index_path, "r") as f:
-            content = f.read()
-        if len(content) > 2000:
-            content = content[:2000]
-
-        try:
-            time.sleep(3)
-            output = generate_image(content, ptype)
-            if decode_and_save(output, filepath):
-                kb = os.path.getsize(filepath) / 1024
-                print("  OK %s (%.0f KB)" % (filename, kb), flush=True)
-                ok += 1
-            else:
-                print("  FAIL empty API response", flush=True)
-        except Exception as e:
-            print("  FAIL %s" % e, flush=True)
-
+    ok = asyncio.run(run_tasks(tasks, output_dir, use_cache=not args.no_cache))
     print("\nDone: %d/%d succeeded. Output: %s" % (ok, len(tasks), output_dir))
 
 
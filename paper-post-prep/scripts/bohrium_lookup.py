@@ -5,16 +5,24 @@ Usage:
     python3 bohrium_lookup.py --doi "10.1234/example"
     python3 bohrium_lookup.py --title "Attention Is All You Need"
     python3 bohrium_lookup.py --doi "10.1234/example" --title "Fallback Title"
+    python3 bohrium_lookup.py --doi "10.1234/example" --no-cache
+    python3 bohrium_lookup.py --doi-file dois.txt --titles-file titles.txt
 
 Returns JSON with paper URL, metadata, and author info from Bohrium's database.
+With --doi-file / --titles-file (one entry per line), all entries are looked up
+in a single batched request and the output maps each DOI/title to its result.
 Credentials are read from ~/content_writer/blog/.env
+Hits are cached for 7 days under ~/.cache/bohrium/ (skip with --no-cache).
 """
 
 import argparse
+import functools
 import hashlib
 import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import quote
 
@@ -25,6 +33,8 @@ except ImportError:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print(json.dumps({"error": "requests not installed. Run: pip install requests"}))
     sys.exit(1)
@@ -32,6 +42,25 @@ except ImportError:
 
 ENV_PATH = os.path.expanduser("~/content_writer/blog/.env")
 API_BASE = "https://security.bohrium.com/paper/pass"
+CACHE_DIR = os.path.expanduser("~/.cache/bohrium")
+CACHE_TTL = 7 * 24 * 3600  # seconds
+BATCH_SIZE = 50  # queries per API request
+
+
+def make_session() -> "requests.Session":
+    """Create a keep-alive session that retries transient gateway errors."""
+    session = requests.Session()
+    # Lookups are read-only, so retrying POST is safe
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                  allowed_methods=frozenset({"GET", "POST"}))
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# One pooled session per process: DOI + title fallback share a TLS connection
+SESSION = make_session()
 
 
 def load_env(path: str) -> dict:
@@ -60,36 +89,99 @@ def get_digester(access_key: str, access_secret: str) -> str:
         tz = timezone(timedelta(hours=8))
         now = datetime.now(tz)
     current_minutes = now.strftime("%Y%m%d%H%M")
-    data = access_key + access_secret[:10] + current_minutes
-    return hashlib.sha512(data.encode()).hexdigest()
-
-
-def lookup_by_doi(doi: str, access_key: str, access_secret: str) -> dict:
+    return _digest(access_key, access_secret[:10], current_minutes)
+
+
+@functools.lru_cache(maxsize=4)
+def _digest(access_key: str, secret_prefix: str, minute_str: str) -> str:
+    """SHA-512 of the auth string; its input only changes once a minute."""
+    return hashlib.sha512((access_key + secret_prefix + minute_str).encode()).hexdigest()
+
+
+def _cache_path(kind: str, query: str, access_key: str) -> str:
+    """Cache file for one lookup. The access key is mixed in so switching
+    credentials never serves another account's results."""
+    key = json.dumps([kind, query, access_key])
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+
+def _cache_get(path: str, ttl: int = CACHE_TTL):
+    """Return the cached raw result, or None if missing, stale or unreadable."""
+    try:
+        if time.time() - os.path.getmtime(path) >= ttl:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_put(path: str, raw: dict):
+    """Write a raw result atomically. Cache failures are never fatal."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(raw, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _lookup_batch(kind: str, queries: list, access_key: str, access_secret: str,
+                  use_cache: bool = True) -> dict:
+    """Look up many DOIs or titles, one HTTP round-trip per BATCH_SIZE misses.
+
+    Cached hits are served locally; only the remaining queries are posted.
+    Returns {query: raw} with an empty dict for papers that were not found.
+    """
+    endpoint, field = ("dois", "dois") if kind == "doi" else ("title", "titles")
+    results = {}
+    pending = []
+    for query in dict.fromkeys(queries):  # dedupe, keep order
+        raw = _cache_get(_cache_path(kind, query, access_key)) if use_cache else None
+        if raw is not None:
+            results[query] = raw
+        else:
+            pending.append(query)
+
+    for start in range(0, len(pending), BATCH_SIZE):
+        batch = pending[start:start + BATCH_SIZE]
+        payload = {
+            "accessKey": access_key,
+            "digester": get_digester(access_key, access_secret),
+            field: batch if kind == "doi" else [{"enName": t} for t in batch],
+        }
+        resp = SESSION.post(f"{API_BASE}/{endpoint}", json=payload, timeout=60)
+        resp.raise_for_status()
+        data = resp.json().get("data", {}) or {}
+        for query in batch:
+            raw = data.get(query, {}) or {}
+            results[query] = raw
+            # Only hits are cached, so a paper Bohrium indexes later is still found
+            if raw and use_cache:
+                _cache_put(_cache_path(kind, query, access_key), raw)
+    return results
+
+
+def lookup_dois(dois: list, access_key: str, access_secret: str, use_cache: bool = True) -> dict:
+    """Look up papers by DOI in batch. Returns {doi: raw}."""
+    return _lookup_batch("doi", dois, access_key, access_secret, use_cache)
+
+
+def lookup_titles(titles: list, access_key: str, access_secret: str, use_cache: bool = True) -> dict:
+    """Look up papers by English title in batch. Returns {title: raw}."""
+    return _lookup_batch("title", titles, access_key, access_secret, use_cache)
+
+
+def lookup_by_doi(doi: str, access_key: str, access_secret: str, use_cache: bool = True) -> dict:
     """Look up paper by DOI."""
-    digester = get_digester(access_key, access_secret)
-    payload = {
-        "accessKey": access_key,
-        "digester": digester,
-        "dois": [doi],
-    }
-    resp = requests.post(f"{API_BASE}/dois", json=payload, timeout=60)
-    resp.raise_for_status()
-    data = resp.json().get("data", {}) or {}
-    return data.get(doi, {}) or {}
+    return lookup_dois([doi], access_key, access_secret, use_cache)[doi]
 
 
-def lookup_by_title(title: str, access_key: str, access_secret: str) -> dict:
+def lookup_by_title(title: str, access_key: str, access_secret: str, use_cache: bool = True) -> dict:
     """Look up paper by English title."""
-    digester = get_digester(access_key, access_secret)
-    payload = {
-        "accessKey": access_key,
-        "digester": digester,
-        "titles": [{"enName": title}],
-    }
-    resp = requests.post(f"{API_BASE}/title", json=payload, timeout=60)
-    resp.raise_for_status()
-    data = resp.json().get("data", {}) or {}
-    return data.get(title, {}) or {}
+    return lookup_titles([title], access_key, access_secret, use_cache)[title]
 
 
 def format_result(raw: dict) -> dict:
@@ -130,15 +222,24 @@ def format_result(raw: dict) -> dict:
     }
 
 
+def read_lines(path: str) -> list:
+    """Read one entry per line, skipping blanks and # comments."""
+    with open(os.path.expanduser(path)) as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Look up paper on Bohrium")
     parser.add_argument("--doi", help="Paper DOI")
     parser.add_argument("--title", help="Paper English title")
+    parser.add_argument("--doi-file", help="File with one DOI per line (batch mode)")
+    parser.add_argument("--titles-file", help="File with one English title per line (batch mode)")
     parser.add_argument("--env", default=ENV_PATH, help="Path to .env file")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk result cache")
     args = parser.parse_args()
 
-    if not args.doi and not args.title:
-        parser.error("Provide at least one of --doi or --title")
+    if not (args.doi or args.title or args.doi_file or args.titles_file):
+        parser.error("Provide at least one of --doi, --title, --doi-file or --titles-file")
 
     env = load_env(args.env)
     access_key = env.get("DOI_API_ACCESS_KEY", "")
@@ -148,21 +249,43 @@ def main():
         print(json.dumps({"error": "Missing DOI_API_ACCESS_KEY or DOI_API_ACCESS_SECRET in .env"}))
         sys.exit(1)
 
+    use_cache = not args.no_cache
+
+    # Batch mode: one request per endpoint, output keyed by DOI / title
+    if args.doi_file or args.titles_file:
+        dois = (read_lines(args.doi_file) if args.doi_file else []) + ([args.doi] if args.doi else [])
+        titles = (read_lines(args.titles_file) if args.titles_file else []) + ([args.title] if args.title else [])
+        results = {}
+        for kind, queries, lookup in (("DOI", dois, lookup_dois), ("Title", titles, lookup_titles)):
+            if not queries:
+                continue
+            try:
+                for query, raw in lookup(queries, access_key, access_secret, use_cache).items():
+                    results[query] = format_result(raw)
+            except Exception as e:
+                for query in queries:
+                    results.setdefault(query, {"error": f"{kind} lookup failed: {e}"})
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    # Fire DOI and title lookups together so a DOI miss doesn't pay for a second round-trip
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_doi = ex.submit(lookup_by_doi, args.doi, access_key, access_secret, use_cache) if args.doi else None
+        f_title = ex.submit(lookup_by_title, args.title, access_key, access_secret, use_cache) if args.title else None
+
     result = {}
 
-    # Try DOI first (more precise)
-    if args.doi:
+    # Prefer the DOI result (more precise)
+    if f_doi:
         try:
-            raw = lookup_by_doi(args.doi, access_key, access_secret)
-            result = format_result(raw)
+            result = format_result(f_doi.result())
         except Exception as e:
             result = {"error": f"DOI lookup failed: {e}"}
 
     # Fall back to title if DOI didn't work
-    if (not result or not result.get("found")) and args.title:
+    if (not result or not result.get("found")) and f_title:
         try:
-            raw = lookup_by_title(args.title, access_key, access_secret)
-            result = format_result(raw)
+            result = format_result(f_title.result())
         except Exception as e:
             if not result or "error" not in result:
                 result = {"error": f"Title lookup failed: {e}"}
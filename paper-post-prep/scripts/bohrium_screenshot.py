@@ -3,68 +3,172 @@
 
 Usage:
     python3 bohrium_screenshot.py "https://www.bohrium.com/en/paper-details/..." [--output ~/Downloads/POTD-0216-bohrium.png]
+    python3 bohrium_screenshot.py URL1 URL2 URL3 --output-template ~/Downloads/bohrium-{i}.png
+
+Several URLs share one Chromium instance, so only the first pays the browser start-up.
+Outputs ending in .jpg/.jpeg (or --format jpeg) are saved as JPEG at quality 85.
 """
 
 import argparse
 import sys
 from pathlib import Path
+from urllib.parse import urlparse
 
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
+# Elements that only exist once the paper details have rendered
+CONTENT_SELECTOR = "div.paper-details, h1.paper-title, [data-testid='paper-title']"
+
+# Cookie banners and popups that may cover the paper
+POPUP_SELECTOR = "button:has-text('Accept'), button:has-text('Got it'), .modal-close, [aria-label='Close']"
+
+# Requests that never show up in the clipped screenshot. Images stay allowed
+# since paper figures can land inside the clip region.
+BLOCKED_RESOURCE_TYPES = {"media", "font"}
+# Analytics hosts, matched against the request hostname (or a subdomain of it)
+BLOCKED_DOMAINS = ("googletagmanager.com", "google-analytics.com", "hotjar.com", "segment.io", "segment.com")
+
+JPEG_QUALITY = 85
+
+
+def _is_jpeg(path: str) -> bool:
+    return Path(path).suffix.lower() in (".jpg", ".jpeg")
+
+
+def _is_tracker(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == d or host.endswith("." + d) for d in BLOCKED_DOMAINS)
+
+
+def _block_noise(route):
+    request = route.request
+    if not request.is_navigation_request() and (
+            request.resource_type in BLOCKED_RESOURCE_TYPES or _is_tracker(request.url)):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _capture(page, url: str, output: str, wait_ms: int):
+    """Load one paper page in an open tab and save the clipped screenshot."""
+    print(f"Loading {url} ...")
+    page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
+    # Wait for the paper content itself rather than the whole network;
+    # analytics keep networkidle from firing on many pages
+    try:
+        page.wait_for_selector(CONTENT_SELECTOR, timeout=15000)
+    except PlaywrightTimeoutError:
+        print("Paper content selector not found, capturing anyway", file=sys.stderr)
+
+    # Give late requests (figures, fonts) a chance to settle, up to wait_ms
+    try:
+        page.wait_for_load_state("networkidle", timeout=wait_ms)
+    except PlaywrightTimeoutError:
+        pass
+
+    # Try to dismiss cookie banners or popups; one query covers every known banner
+    try:
+        for el in page.query_selector_all(POPUP_SELECTOR):
+            if el.is_visible():
+                el.click()
+                page.wait_for_timeout(300)
+                break
+    except Exception:
+        pass
+
+    # Crop out the left sidebar and top nav by clipping the main content area
+    # Sidebar is ~220px wide, top nav is ~50px tall on Bohrium paper pages
+    clip_x = 220
+    clip_y = 0
+    clip_width = 1600 - clip_x
+    clip_height = 940
+
+    # JPEG is several times smaller than PNG for these text-and-photo pages
+    extra = {"type": "jpeg", "quality": JPEG_QUALITY} if _is_jpeg(output) else {"type": "png"}
+    page.screenshot(path=output, full_page=False, clip={
+        "x": clip_x, "y": clip_y,
+        "width": clip_width, "height": clip_height
+    }, **extra)
+    print(f"Screenshot saved: {output}")
 
-def take_screenshot(url: str, output: str = "", wait_ms: int = 3000):
-    """Open a Bohrium paper page and take a screenshot.
+
+def take_screenshots(urls: list, outputs: list, wait_ms: int = 3000) -> list:
+    """Screenshot several Bohrium paper pages with a single browser.
 
     Args:
-        url: Bohrium paper URL.
-        output: Output file path. Defaults to ~/Downloads/bohrium-screenshot.png.
-        wait_ms: Time to wait for page to load (ms).
-    """
-    if not output:
-        output = str(Path.home() / "Downloads" / "bohrium-screenshot.png")
+        urls: Bohrium paper URLs.
+        outputs: Output file path for each URL.
+        wait_ms: Upper bound on waiting for the network to settle (ms).
 
-    output = str(Path(output).expanduser().resolve())
+    Returns:
+        The URLs that failed.
+    """
+    outputs = [str(Path(o).expanduser().resolve()) for o in outputs]
+    failed = []
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        page = browser.new_page(viewport={"width": 1600, "height": 1000})
+        context = browser.new_context(viewport={"width": 1600, "height": 1000})
+        context.route("**/*", _block_noise)
+        for url, output in zip(urls, outputs):
+            page = context.new_page()
+            try:
+                _capture(page, url, output, wait_ms)
+            except Exception as e:
+                print(f"Failed {url}: {e}", file=sys.stderr)
+                failed.append(url)
+            finally:
+                page.close()
+        browser.close()
 
-        print(f"Loading {url} ...")
-        page.goto(url, wait_until="networkidle", timeout=30000)
+    return failed
 
-        # Extra wait for dynamic content to render
-        page.wait_for_timeout(wait_ms)
 
-        # Try to dismiss cookie banners or popups
-        for selector in ["button:has-text('Accept')", "button:has-text('Got it')", ".modal-close", "[aria-label='Close']"]:
-            try:
-                el = page.query_selector(selector)
-                if el and el.is_visible():
-                    el.click()
-                    page.wait_for_timeout(500)
-            except Exception:
-                pass
-
-        # Crop out the left sidebar and top nav by clipping the main content area
-        # Sidebar is ~220px wide, top nav is ~50px tall on Bohrium paper pages
-        clip_x = 220
-        clip_y = 0
-        clip_width = 1600 - clip_x
-        clip_height = 940
-
-        page.screenshot(path=output, full_page=False, clip={
-            "x": clip_x, "y": clip_y,
-            "width": clip_width, "height": clip_height
-        })
-        browser.close()
+def take_screenshot(url: str, output: str = "", wait_ms: int = 3000):
+    """Open a Bohrium paper page and take a screenshot.
 
-    print(f"Screenshot saved: {output}")
+    Args:
+        url: Bohrium paper URL.
+        output: Output file path. Defaults to ~/Downloads/bohrium-screenshot.png.
+        wait_ms: Upper bound on waiting for the network to settle (ms).
+    """
+    if not output:
+        output = str(Path.home() / "Downloads" / "bohrium-screenshot.png")
+    if take_screenshots([url], [output], wait_ms):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Screenshot a Bohrium paper page")
-    parser.add_argument("url", help="Bohrium paper URL")
-    parser.add_argument("--output", "-o", default="", help="Output file path")
-    parser.add_argument("--wait", type=int, default=3000, help="Wait time in ms (default: 3000)")
+    parser = argparse.ArgumentParser(description="Screenshot Bohrium paper pages")
+    parser.add_argument("urls", nargs="+", help="Bohrium paper URL(s)")
+    parser.add_argument("--output", "-o", default="", help="Output file path (single URL only)")
+    parser.add_argument("--output-template", "-t", default="",
+                        help="Output path with {i} for the 1-based URL index "
+                             "(default: ~/Downloads/bohrium-screenshot-{i}.png for several URLs)")
+    parser.add_argument("--format", choices=["png", "jpeg"], default=None,
+                        help="Image format; sets the output extension (default: from the output path, else png)")
+    parser.add_argument("--wait", type=int, default=3000, help="Max wait for network to settle in ms (default: 3000)")
     args = parser.parse_args()
-    take_screenshot(args.url, args.output, args.wait)
+
+    if args.output and len(args.urls) > 1:
+        parser.error("--output takes a single URL; use --output-template for several")
+
+    if args.output_template:
+        if len(args.urls) > 1 and "{i}" not in args.output_template:
+            parser.error("--output-template must contain {i} when several URLs are given")
+        outputs = [args.output_template.replace("{i}", str(i)) for i in range(1, len(args.urls) + 1)]
+    elif len(args.urls) > 1:
+        template = str(Path.home() / "Downloads" / "bohrium-screenshot-{i}.png")
+        outputs = [template.replace("{i}", str(i)) for i in range(1, len(args.urls) + 1)]
+    else:
+        outputs = [args.output or str(Path.home() / "Downloads" / "bohrium-screenshot.png")]
+
+    if args.format:
+        suffix = ".jpg" if args.format == "jpeg" else ".png"
+        outputs = [o if _is_jpeg(o) == (args.format == "jpeg") else str(Path(o).with_suffix(suffix))
+                   for o in outputs]
+
+    if take_screenshots(args.urls, outputs, args.wait):
+        sys.exit(1)
@@ -12,13 +12,20 @@ large images from earlier pages with reasonable aspect ratios.
 """
 
 import argparse
+import heapq
 import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
 import fitz  # PyMuPDF
 
+# Below this many images per worker, process start-up costs more than it saves
+IMAGES_PER_WORKER = 8
+
 
 def score_figure(img: dict, total_pages: int) -> float:
     """Score a figure for social-media-post suitability.
@@ -52,6 +59,92 @@ def score_figure(img: dict, total_pages: int) -> float:
     return size_score * 0.3 + page_score * 0.4 + ratio_score * 0.15 + res_score * 0.15
 
 
+def _stream_size(doc, xref: int) -> int:
+    """Compressed size of an image stream, read from the PDF without decoding."""
+    kind, value = doc.xref_get_key(xref, "Length")
+    if kind == "int":
+        return int(value)
+    return len(doc.xref_stream_raw(xref) or b"")
+
+
+def _scan_images(doc, min_size: int) -> list:
+    """List candidate images from page metadata only -- nothing is decoded.
+
+    An image reused across pages (logos, headers) shares one xref; it is
+    listed once, on the earliest page it appears.
+    """
+    candidates = []
+    seen = set()
+    for page_num, page in enumerate(doc):
+        for img_idx, img_info in enumerate(page.get_images(full=True)):
+            xref, width, height = img_info[0], img_info[2], img_info[3]
+
+            if xref in seen:
+                continue
+            seen.add(xref)
+
+            if width < min_size and height < min_size:
+                continue
+
+            candidates.append({
+                "xref": xref,
+                "page": page_num + 1,
+                "img_idx": img_idx + 1,
+                "width": width,
+                "height": height,
+                "size_kb": _stream_size(doc, xref) / 1024,
+            })
+    return candidates
+
+
+def _extract_images(pdf_path: str, xrefs: list, tmp_dir: str) -> list:
+    """Decode images by xref, writing each straight to a temp file in tmp_dir.
+
+    Returns (tmp_path, ext) per xref, or None on failure. Image bytes are
+    dropped as soon as they hit disk instead of piling up in memory.
+    """
+    results = []
+    with fitz.open(pdf_path) as doc:
+        for xref in xrefs:
+            try:
+                base_image = doc.extract_image(xref)
+            except Exception:
+                base_image = None
+            if not base_image:
+                results.append(None)
+                continue
+            with tempfile.NamedTemporaryFile(dir=tmp_dir, prefix=".fig-", suffix="." + base_image["ext"],
+                                             delete=False) as tmp:
+                tmp.write(base_image["image"])
+            results.append((tmp.name, base_image["ext"]))
+    return results
+
+
+def _extract_parallel(pdf_path: str, xrefs: list, tmp_dir: str) -> list:
+    """_extract_images across worker processes for large batches.
+
+    PyMuPDF documents must not be shared across threads, so each worker
+    process opens its own copy of the PDF.
+    """
+    workers = max(1, min(os.cpu_count() or 1, len(xrefs) // IMAGES_PER_WORKER))
+    if workers == 1:
+        return _extract_images(pdf_path, xrefs, tmp_dir)
+    bounds = [len(xrefs) * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        chunks = ex.map(_extract_images, [pdf_path] * workers,
+                        [xrefs[lo:hi] for lo, hi in zip(bounds, bounds[1:])], [tmp_dir] * workers)
+        return [res for chunk in chunks for res in chunk]
+
+
+def _ranked(candidates: list, n: int):
+    """Yield candidates best-first, only sorting past the top n if they run out."""
+    key = lambda x: x["score"]
+    top = heapq.nlargest(n, candidates, key=key)
+    yield from top
+    if len(top) < len(candidates):
+        yield from sorted(candidates, key=key, reverse=True)[n:]
+
+
 def extract_figures(
     pdf_path: str,
     output_dir: Optional[str] = None,
@@ -88,41 +181,10 @@ def extract_figures(
     if not prefix:
         prefix = pdf_path.stem
 
-    doc = fitz.open(str(pdf_path))
-    total_pages = len(doc)
-    candidates = []
-
-    for page_num in range(total_pages):
-        page = doc[page_num]
-        image_list = page.get_images(full=True)
-
-        for img_idx, img_info in enumerate(image_list):
-            xref = img_info[0]
-            try:
-                base_image = doc.extract_image(xref)
-            except Exception:
-                continue
-            if base_image is None:
-                continue
-
-            width = base_image["width"]
-            height = base_image["height"]
-
-            if width < min_size and height < min_size:
-                continue
-
-            candidates.append({
-                "xref": xref,
-                "page": page_num + 1,
-                "img_idx": img_idx + 1,
-                "width": width,
-                "height": height,
-                "ext": base_image["ext"],
-                "bytes": base_image["image"],
-                "size_kb": len(base_image["image"]) / 1024,
-            })
-
-    doc.close()
+    # Phase 1: rank on metadata (dimensions, stream size) without decoding
+    with fitz.open(str(pdf_path)) as doc:
+        total_pages = len(doc)
+        candidates = _scan_images(doc, min_size)
 
     if not candidates:
         print("No figures found (all images were below minimum size threshold).")
@@ -132,24 +194,36 @@ def extract_figures(
     for img in candidates:
         img["score"] = score_figure(img, total_pages)
 
-    candidates.sort(key=lambda x: x["score"], reverse=True)
-
-    # Decide which to keep
-    to_save = candidates if keep_all else candidates[:top_n]
-
-    # Save
+    # Phase 2: decode only the winners, moving down the ranking past any
+    # image PyMuPDF can't extract. Decoded files sit in a scratch dir inside
+    # output_dir (same filesystem, so os.replace is a rename); whatever is not
+    # moved out -- on a failure or a worker crash -- goes with the dir
+    want = len(candidates) if keep_all else top_n
+    ranked = _ranked(candidates, want)
     saved = []
-    for i, img in enumerate(to_save, 1):
-        if keep_all:
-            filename = f"page{img['page']}_img{img['img_idx']}_{img['width']}x{img['height']}.{img['ext']}"
-        else:
-            filename = f"{prefix}-fig{i}-p{img['page']}.{img['ext']}"
-
-        filepath = output_dir / filename
-        with open(filepath, "wb") as f:
-            f.write(img["bytes"])
-        img["file"] = str(filepath)
-        saved.append(img)
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix=".figs-") as tmp_dir:
+        to_save = []
+        while len(to_save) < want:
+            batch = list(islice(ranked, want - len(to_save)))
+            if not batch:
+                break
+            decoded = _extract_parallel(str(pdf_path), [img["xref"] for img in batch], tmp_dir)
+            for img, result in zip(batch, decoded):
+                if result:
+                    img["tmp_path"], img["ext"] = result
+                    to_save.append(img)
+
+        # Save
+        for i, img in enumerate(to_save, 1):
+            if keep_all:
+                filename = f"page{img['page']}_img{img['img_idx']}_{img['width']}x{img['height']}.{img['ext']}"
+            else:
+                filename = f"{prefix}-fig{i}-p{img['page']}.{img['ext']}"
+
+            filepath = output_dir / filename
+            os.replace(img["tmp_path"], filepath)
+            img["file"] = str(filepath)
+            saved.append(img)
 
     # Print summary
     print(f"\nScanned {len(candidates)} images from {pdf_path.name} ({total_pages} pages)")
@@ -8,25 +8,71 @@ Each card includes: title, explanation, illustration, QR code, short URL, brandi
 Usage:
     python generate_wordcard.py <url_or_keyword> [--style dark|light|gradient] [--utm SOURCE]
     python generate_wordcard.py "monte_carlo_simulation" --style dark --utm twitter
-    echo -e "fourier_transform\ngraph_neural_network" | python generate_wordcard.py --batch
+    echo -e "fourier_transform\ngraph_neural_network" | python generate_wordcard.py --batch [--jobs N]
 
 The illustration is auto-selected based on keyword category. Override with --illust <type>.
 Types: scatter, wave, network, hexgrid, orbit, field, spiral, dots (or 'none')
+
+Missing dependencies are pip-installed on first run. On x86_64 Pillow-SIMD is tried
+before stock Pillow; an existing Pillow install is left alone. Once everything imports,
+a marker in the temp dir lets later runs skip the check.
+
+Importing the module has no side effects beyond that, so callers can batch in-process:
+    import generate_wordcard; generate_wordcard.main(["fourier_transform", "-s", "dark"])
 """
 
-import subprocess, sys, os, textwrap, argparse, re, math, random, json, html
+import subprocess, sys, os, textwrap, argparse, re, math, random, json, html, functools, platform, multiprocessing
+import importlib.util, tempfile, zlib
 
-def ensure_deps():
-    for pkg, mod in [("qrcode", "qrcode"), ("Pillow", "PIL")]:
+# Written once every dependency imports; later runs skip the probes entirely.
+# Holds the interpreter path so a different Python still gets checked.
+_DEPS_OK_MARKER = os.path.join(tempfile.gettempdir(), ".sciencepedia_deps_ok")
+
+def ensure_deps(force=False):
+    if not force:
         try:
-            __import__(mod)
-        except ImportError:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", pkg, "-q"])
+            with open(_DEPS_OK_MARKER) as f:
+                if f.read() == sys.executable:
+                    return
+        except OSError:
+            pass
+    for pkg, mod in [("qrcode", "qrcode"), ("Pillow", "PIL"), ("numpy", "numpy")]:
+        if importlib.util.find_spec(mod) is not None:
+            continue
+        # Pillow-SIMD is a faster drop-in on x86; it needs a compiler, so fall back to Pillow
+        if pkg == "Pillow" and platform.machine() in ("x86_64", "AMD64"):
+            if subprocess.call([sys.executable, "-m", "pip", "install", "pillow-simd", "-q"]) == 0:
+                continue
+        subprocess.check_call([sys.executable, "-m", "pip", "install", pkg, "-q"])
+    importlib.invalidate_caches()
+    if platform.machine() in ("x86_64", "AMD64"):
+        import PIL
+        if ".post" not in PIL.__version__:  # Pillow-SIMD releases are versioned X.Y.Z.postN
+            print("  ⚠ Using stock Pillow; Pillow-SIMD draws faster: pip uninstall -y pillow && "
+                  "CC=\"cc -mavx2\" pip install -U --force-reinstall pillow-simd", file=sys.stderr)
+    try:
+        with open(_DEPS_OK_MARKER, "w") as f:
+            f.write(sys.executable)
+    except OSError:
+        pass
 
 ensure_deps()
 
-import qrcode
-from PIL import Image, ImageDraw, ImageFont
+try:
+    import numpy as np
+    import qrcode
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    # Stale marker (packages removed since it was written): probe and install again
+    ensure_deps(force=True)
+    import numpy as np
+    import qrcode
+    from PIL import Image, ImageDraw, ImageFont
+
+try:
+    import ahocorasick  # optional: pyahocorasick, faster keyword matching
+except ImportError:
+    ahocorasick = None
 
 # ── Config ─────────────────────────────────────────────────
 BASE_URL = "https://www.bohrium.com/en/sciencepedia/feynman/keyword"
@@ -171,13 +217,67 @@ CATEGORY_KEYWORDS = {
 }
 
 
-def guess_category(slug):
+def _trie_regex(words):
+    """Regex matching any of `words`, with shared prefixes factored out.
+
+    Python's re tries alternatives one by one; a trie-shaped pattern only
+    follows branches that match the next character. Among keywords starting
+    at the same position the longest one matches.
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        alts = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:%s)" % "|".join(alts)
+        return "(?:%s)?" % body if "" in node else body
+
+    return build(trie)
+
+
+# Keyword → index of the earliest category that any keyword it starts with
+# belongs to. The regex reports only the longest keyword at each position,
+# and every shorter keyword that also matches there is one of its prefixes.
+_CATEGORY_NAMES = list(CATEGORY_KEYWORDS)
+_KEYWORD_RANK = {}
+for _rank, _kws in enumerate(CATEGORY_KEYWORDS.values()):
+    for _kw in _kws:
+        _KEYWORD_RANK.setdefault(_kw, _rank)
+_KEYWORD_RANK = {kw: min(_KEYWORD_RANK.get(kw[:i], _rank) for i in range(1, len(kw) + 1))
+                 for kw, _rank in _KEYWORD_RANK.items()}
+_CATEGORY_RE = None
+_CATEGORY_AUTOMATON = None
+if ahocorasick is not None:
+    # Aho-Corasick reports every keyword occurrence in one pass over the slug
+    _CATEGORY_AUTOMATON = ahocorasick.Automaton()
+    for _kw, _rank in _KEYWORD_RANK.items():
+        _CATEGORY_AUTOMATON.add_word(_kw, _rank)
+    _CATEGORY_AUTOMATON.make_automaton()
+else:
+    _CATEGORY_RE = re.compile("(?=(%s))" % _trie_regex(_KEYWORD_RANK))
+
+
+def _match_category(slug):
+    """Category of the slug's keyword hits, or None when no keyword occurs in it."""
+    # Same result as checking categories in order: the earliest category with any keyword hit
     slug_lower = slug.lower()
-    for cat, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in slug_lower:
-                return cat
-    return "dots"  # default fallback
+    if _CATEGORY_AUTOMATON is not None:
+        ranks = [rank for _, rank in _CATEGORY_AUTOMATON.iter(slug_lower)]
+    else:
+        ranks = [_KEYWORD_RANK[kw] for kw in _CATEGORY_RE.findall(slug_lower)]
+    if ranks:
+        return _CATEGORY_NAMES[min(ranks)]
+    return None
+
+
+def guess_category(slug):
+    return _match_category(slug) or "dots"  # default fallback
 
 
 # ── Font Helper (支持字体层级) ─────────────────────────────────
@@ -209,19 +309,30 @@ FONT_PATHS = {
     ],
 }
 
+_RESOLVED_FONT_PATH = {}  # role → first font file that loaded
+
+
+@functools.lru_cache(maxsize=64)
 def _font(size, role="body"):
     """role: 'title' | 'body' | 'mono'"""
+    if role in _RESOLVED_FONT_PATH:
+        return ImageFont.truetype(_RESOLVED_FONT_PATH[role], size)
     paths = FONT_PATHS.get(role, FONT_PATHS["body"])
     for p in paths:
         if os.path.exists(p):
             try:
-                return ImageFont.truetype(p, size)
+                font = ImageFont.truetype(p, size)
             except Exception:
                 continue
+            _RESOLVED_FONT_PATH[role] = p
+            return font
     return ImageFont.load_default()
 
 
 def _rounded_rect(draw, xy, r, fill):
+    if hasattr(draw, "rounded_rectangle"):  # Pillow >= 8.2
+        draw.rounded_rectangle(xy, radius=r, fill=fill)
+        return
     x0, y0, x1, y1 = xy
     draw.rectangle([x0 + r, y0, x1 - r, y1], fill=fill)
     draw.rectangle([x0, y0 + r, x1, y1 - r], fill=fill)
@@ -233,40 +344,111 @@ def _rounded_rect(draw, xy, r, fill):
 
 
 # ── Smart Truncate (改动 3) ─────────────────────────────────
+@functools.lru_cache(maxsize=8)
+def _wrapper(width):
+    return textwrap.TextWrapper(width=width)
+
+
 def smart_truncate(text, wrap_width, max_lines):
     """Truncate text at sentence/clause boundaries when it exceeds max_lines."""
-    lines = textwrap.wrap(text, width=wrap_width)
+    wrapper = _wrapper(wrap_width)
+    lines = wrapper.wrap(text)
     if len(lines) <= max_lines:
         return lines
     # Text is too long — find a good cut point
-    merged = " ".join(lines[:max_lines])
+    lines = lines[:max_lines]
+    merged = " ".join(lines)
     min_pos = len(merged) // 2  # don't cut before 50%
-    # Try sentence boundary first
+    # Try sentence boundary first, then comma, then fall back to word boundary
     cut = merged.rfind(". ", min_pos)
+    if cut == -1:
+        cut = merged.rfind(", ", min_pos)
     if cut != -1:
-        return textwrap.wrap(merged[:cut + 1] + "...", width=wrap_width)
-    # Try comma boundary
-    cut = merged.rfind(", ", min_pos)
-    if cut != -1:
-        return textwrap.wrap(merged[:cut + 1] + "...", width=wrap_width)
-    # Fall back to word boundary
-    cut = merged.rfind(" ", min_pos)
-    if cut != -1:
-        return textwrap.wrap(merged[:cut] + "...", width=wrap_width)
-    return textwrap.wrap(merged + "...", width=wrap_width)
+        cut += 1
+    else:
+        cut = merged.rfind(" ", min_pos)
+    if cut == -1:
+        cut = len(merged)
+    # Lines before the one holding the cut wrap the same either way; only that
+    # line needs re-flowing once "..." is appended
+    start = 0
+    for i, line in enumerate(lines):
+        if start + len(line) >= cut:
+            break
+        start += len(line) + 1
+    tail = merged[start:cut] + "..."
+    kept = [line.rstrip() for line in lines[:i]]  # a broken long word leaves a trailing space
+    return kept + (wrapper.wrap(tail) if len(tail) > wrap_width else [tail])
 
 
 # ── Illustration Drawing Functions ──────────────────────────
+def _draw_path(draw, pts, rgb, alphas, width, quantum=16):
+    """Draw a path where segment i (pts[i] → pts[i+1]) has alpha alphas[i].
+
+    Alphas are rounded to the nearest `quantum` and each run of equal alpha
+    becomes a single polyline call.
+    """
+    run, cur = [pts[0]], None
+    for pt, a in zip(pts[1:], alphas):
+        q = min(255, int(round(a / quantum)) * quantum)
+        if q != cur and len(run) > 1:
+            draw.line(run, fill=(*rgb, cur), width=width, joint="curve")
+            run = [run[-1]]
+        cur = q
+        run.append(pt)
+    if len(run) > 1:
+        draw.line(run, fill=(*rgb, cur), width=width, joint="curve")
+
+
+# Shared sample positions in [0, 1] for the curve drawers
+_T100 = np.linspace(0, 1, 100)
+_T200 = np.linspace(0, 1, 200)
+# Unit-height bell curve over _T100 (mean 0.5, sd 0.15) for _draw_distribution
+_GAUSS100 = np.exp(-0.5 * ((_T100 - 0.5) / 0.15) ** 2)
+
+
+@functools.lru_cache(maxsize=16)
+def _trig(n, k=1):
+    """sin(k*a), cos(k*a) for n angles a = 2*pi*t/(n-1), t = 0..n-1; shared, read-only."""
+    a = k * (2 * np.pi * np.arange(n) / (n - 1))
+    sin, cos = np.sin(a), np.cos(a)
+    sin.flags.writeable = cos.flags.writeable = False
+    return sin, cos
+
+
+def _draw_disks(draw, xs, ys, radii, fills):
+    """Paint filled disks from coordinate arrays, in order (later disks on top).
+
+    Bounding boxes are built in one NumPy pass; fills is one RGBA tuple or one per disk.
+    """
+    xs, ys, radii = np.broadcast_arrays(np.asarray(xs), np.asarray(ys), np.asarray(radii))
+    boxes = np.column_stack((xs - radii, ys - radii, xs + radii, ys + radii)).tolist()
+    if isinstance(fills, tuple):
+        fills = [fills] * len(boxes)
+    for box, fill in zip(boxes, fills):
+        draw.ellipse(box, fill=fill)
+
+
+def _plus(draw, x, y, fill):
+    """7px "+" centred on (x, y), stroked instead of set as text."""
+    draw.line([(x - 3, y), (x + 3, y)], fill=fill, width=1)
+    draw.line([(x, y - 3), (x, y + 3)], fill=fill, width=1)
+
+
+def _minus(draw, x, y, fill):
+    """7px "−" centred on (x, y)."""
+    draw.line([(x - 3, y), (x + 3, y)], fill=fill, width=1)
+
+
 def _draw_scatter(draw, cx, cy, sz, c1, c2, seed=0):
     """Monte Carlo: random dots inside/outside quarter circle."""
-    rng = random.Random(42 + seed)
+    rng = np.random.default_rng(42 + seed)
     r = sz // 2
-    for _ in range(160):
-        px, py = rng.uniform(-1, 1), rng.uniform(-1, 1)
-        inside = (px ** 2 + py ** 2) <= 1.0
-        color = (*c1, 200) if inside else (*c2, 120)
-        sx, sy = cx + int(px * r), cy + int(py * r)
-        draw.ellipse([(sx - 5, sy - 5), (sx + 5, sy + 5)], fill=color)
+    pts = rng.uniform(-1, 1, (160, 2))
+    inside = ((pts * pts).sum(axis=1) <= 1.0).tolist()
+    offs = (pts * r).astype(np.int32)
+    c_in, c_out = (*c1, 200), (*c2, 120)
+    _draw_disks(draw, cx + offs[:, 0], cy + offs[:, 1], 5, [c_in if ins else c_out for ins in inside])
     prev = None
     for a in range(91):
         rad = math.radians(a)
@@ -285,10 +467,9 @@ def _draw_wave(draw, cx, cy, sz, c1, c2, seed=0):
         alpha = 220 - wi * 50
         color = (c1[0] + wi * 30, c1[1], c1[2], alpha)
         phase = wi * 0.8 + rng.uniform(-0.3, 0.3)
-        pts = [(cx - r + int(t / 99 * sz), cy + int(amp * math.sin(freq * math.pi * t / 99 + phase)))
-               for t in range(100)]
-        for j in range(1, len(pts)):
-            draw.line([pts[j - 1], pts[j]], fill=color, width=3)
+        xs = cx - r + (_T100 * sz).astype(np.int32)
+        ys = cy + (amp * np.sin(freq * math.pi * _T100 + phase)).astype(np.int32)
+        draw.line(np.column_stack((xs, ys)).ravel().tolist(), fill=color, width=3)
 
 
 def _draw_network(draw, cx, cy, sz, c1, c2, seed=0):
@@ -298,14 +479,23 @@ def _draw_network(draw, cx, cy, sz, c1, c2, seed=0):
     nodes = [(cx + int(rng.uniform(0.2, 0.9) * r * math.cos(a)),
               cy + int(rng.uniform(0.2, 0.9) * r * math.sin(a)))
              for a in [rng.uniform(0, 2 * math.pi) for _ in range(12)]]
+    max_d2 = (r * 0.8) ** 2
     for i in range(len(nodes)):
+        xi, yi = nodes[i]
         for j in range(i + 1, len(nodes)):
-            d = math.dist(nodes[i], nodes[j])
-            if d < r * 0.8:
+            dx, dy = nodes[j][0] - xi, nodes[j][1] - yi
+            d2 = dx * dx + dy * dy
+            if d2 < max_d2:
+                d = math.sqrt(d2)
                 draw.line([nodes[i], nodes[j]], fill=(*c1, max(30, int(120 - d))), width=2)
-    for nx, ny in nodes:
-        draw.ellipse([(nx - 7, ny - 7), (nx + 7, ny + 7)], fill=(*c1, 200))
-        draw.ellipse([(nx - 4, ny - 4), (nx + 4, ny + 4)], fill=(min(c1[0] + 80, 255), min(c1[1] + 60, 255), 255, 255))
+    # Outer ring then bright core for each node, in node order
+    xy = np.repeat(np.array(nodes), 2, axis=0)
+    core = (min(c1[0] + 80, 255), min(c1[1] + 60, 255), 255, 255)
+    _draw_disks(draw, xy[:, 0], xy[:, 1], np.tile([7, 4], len(nodes)), [(*c1, 200), core] * len(nodes))
+
+
+# Unit vertex offsets of a pointy-top hexagon
+_HEX_OFFSETS = [(math.cos(math.radians(60 * i + 30)), math.sin(math.radians(60 * i + 30))) for i in range(6)]
 
 
 def _draw_hexgrid(draw, cx, cy, sz, c1, c2, seed=0):
@@ -314,16 +504,18 @@ def _draw_hexgrid(draw, cx, cy, sz, c1, c2, seed=0):
     rng = random.Random(42 + seed)
     offset_x = rng.randint(-5, 5)
     offset_y = rng.randint(-5, 5)
+    hr08 = hr * 0.8
+    max_d2 = (r * 1.1) ** 2
     for row in range(-4, 5):
         for col in range(-3, 4):
             hx = cx + int(col * hr * 1.75) + offset_x
             hy = cy + int(row * hr * 1.5) + (hr if col % 2 else 0) + offset_y
-            dist = math.dist((hx, hy), (cx, cy))
-            if dist > r * 1.1:
+            dx, dy = hx - cx, hy - cy
+            d2 = dx * dx + dy * dy
+            if d2 > max_d2:
                 continue
-            alpha = max(50, int(190 - dist * 0.8))
-            pts = [(hx + int(hr * 0.8 * math.cos(math.radians(60 * i + 30))),
-                    hy + int(hr * 0.8 * math.sin(math.radians(60 * i + 30)))) for i in range(6)]
+            alpha = max(50, int(190 - math.sqrt(d2) * 0.8))
+            pts = [(hx + int(hr08 * ux), hy + int(hr08 * uy)) for ux, uy in _HEX_OFFSETS]
             for i in range(6):
                 draw.line([pts[i], pts[(i + 1) % 6]], fill=(*c1, alpha), width=2)
 
@@ -349,18 +541,19 @@ def _draw_field(draw, cx, cy, sz, c1, c2, seed=0):
     r = sz // 2
     step = 28
     angle_offset = rng.uniform(0, 0.5)
-    for gx in range(-4, 5):
-        for gy in range(-4, 5):
-            px, py = cx + gx * step, cy + gy * step
-            if math.dist((px, py), (cx, cy)) > r:
-                continue
-            dx, dy = -(py - cy), (px - cx)
-            mag = max(math.sqrt(dx * dx + dy * dy), 1)
-            dx, dy = dx / mag * 10, dy / mag * 10
-            dist = math.dist((px, py), (cx, cy))
-            alpha = max(60, int(180 - dist * 0.7))
-            draw.line([(px, py), (px + dx, py + dy)], fill=(*c1, alpha), width=2)
-            draw.ellipse([(px + dx - 3, py + dy - 3), (px + dx + 3, py + dy + 3)], fill=(*c1, alpha))
+    # Evaluate the whole 9x9 grid at once, then draw only cells inside the radius
+    gx, gy = np.meshgrid(np.arange(-4, 5) * step, np.arange(-4, 5) * step, indexing="ij")
+    gx, gy = gx.ravel(), gy.ravel()
+    dist = np.sqrt(gx * gx + gy * gy)
+    keep = dist <= r
+    gx, gy, dist = gx[keep], gy[keep], dist[keep]
+    mag = np.maximum(dist, 1)
+    dxs, dys = -gy / mag * 10, gx / mag * 10
+    alphas = np.maximum(60, (180 - dist * 0.7).astype(np.int32))
+    for ox, oy, dx, dy, alpha in zip(gx.tolist(), gy.tolist(), dxs.tolist(), dys.tolist(), alphas.tolist()):
+        px, py = cx + ox, cy + oy
+        draw.line([(px, py), (px + dx, py + dy)], fill=(*c1, alpha), width=2)
+        draw.ellipse([(px + dx - 3, py + dy - 3), (px + dx + 3, py + dy + 3)], fill=(*c1, alpha))
 
 
 def _draw_spiral(draw, cx, cy, sz, c1, c2, seed=0):
@@ -368,107 +561,108 @@ def _draw_spiral(draw, cx, cy, sz, c1, c2, seed=0):
     rng = random.Random(42 + seed)
     r = sz // 2
     phase = rng.uniform(0, math.pi)
-    prev1, prev2 = None, None
-    for t in range(200):
-        frac = t / 199
-        y = cy - r + int(frac * sz)
-        x1 = cx + int(30 * math.sin(frac * 6 * math.pi + phase))
-        x2 = cx - int(30 * math.sin(frac * 6 * math.pi + phase))
-        alpha = int(80 + 100 * abs(math.sin(frac * 6 * math.pi + phase)))
-        if prev1:
-            draw.line([prev1, (x1, y)], fill=(*c1, alpha), width=3)
-            draw.line([prev2, (x2, y)], fill=(*c1, max(40, alpha - 60)), width=3)
-        if t % 12 == 0:
-            draw.line([(x1, y), (x2, y)], fill=(*c2, 50), width=2)
-        prev1, prev2 = (x1, y), (x2, y)
+    sin = np.sin(_T200 * 6 * math.pi + phase)
+    offs = (30 * sin).astype(np.int32)
+    ys = (cy - r + (_T200 * sz).astype(np.int32)).tolist()
+    x1s, x2s = (cx + offs).tolist(), (cx - offs).tolist()
+    alphas = (80 + 100 * np.abs(sin)).astype(np.int32)
+    for t in range(0, 200, 12):
+        draw.line([(x1s[t], ys[t]), (x2s[t], ys[t])], fill=(*c2, 50), width=2)
+    _draw_path(draw, list(zip(x1s, ys)), c1, alphas[1:].tolist(), 3)
+    _draw_path(draw, list(zip(x2s, ys)), c1, np.maximum(40, alphas[1:] - 60).tolist(), 3)
 
 
 def _draw_dots(draw, cx, cy, sz, c1, c2, seed=0):
     """Particle cloud with varying density (thermodynamics)."""
-    rng = random.Random(55 + seed)
+    rng = np.random.default_rng(55 + seed)
     r = sz // 2
-    for _ in range(120):
-        a = rng.uniform(0, 2 * math.pi)
-        d = rng.gauss(0, r * 0.4)
-        px, py = cx + int(d * math.cos(a)), cy + int(d * math.sin(a))
-        dist = math.dist((px, py), (cx, cy))
-        if dist > r:
-            continue
-        size = rng.uniform(3, 7)
-        alpha = max(70, int(220 - dist * 0.8))
-        draw.ellipse([(px - size, py - size), (px + size, py + size)], fill=(*c1, alpha))
+    a = rng.uniform(0, 2 * math.pi, 120)
+    d = rng.normal(0, r * 0.4, 120)
+    sizes = rng.uniform(3, 7, 120)
+    px = (d * np.cos(a)).astype(np.int32)
+    py = (d * np.sin(a)).astype(np.int32)
+    dist = np.sqrt(px * px + py * py)
+    keep = dist <= r
+    alphas = np.maximum(70, (220 - dist[keep] * 0.8).astype(np.int32))
+    _draw_disks(draw, cx + px[keep], cy + py[keep], sizes[keep], [(*c1, a) for a in alphas.tolist()])
 
 
 def _draw_bifurcation(draw, cx, cy, sz, c1, c2, seed=0):
     """Chaos theory: logistic map bifurcation diagram."""
-    rng = random.Random(42 + seed)
+    rng = np.random.default_rng(42 + seed)
     r = sz // 2
-    x0, y0 = cx - r, cy - r
+    x0 = cx - r
     init_x = 0.5 + rng.uniform(-0.1, 0.1)
-    for i in range(300):
-        r_val = 2.5 + 1.5 * (i / 299)
-        x = init_x
-        for _ in range(50):
-            x = r_val * x * (1 - x)
-        for _ in range(40):
-            x = r_val * x * (1 - x)
-            px = x0 + int((i / 299) * sz)
-            py = cy + r - int(x * sz)
-            draw.point((px, py), fill=(*c1, rng.randint(100, 220)))
+    # Iterate the logistic map for all 300 r values at once
+    frac = np.arange(300) / 299
+    r_vals = 2.5 + 1.5 * frac
+    x = np.full(300, init_x)
+    for _ in range(50):
+        x = r_vals * x * (1 - x)
+    xs = np.empty((40, 300))
+    for k in range(40):
+        x = r_vals * x * (1 - x)
+        xs[k] = x
+    px = np.broadcast_to(x0 + (frac * sz).astype(np.int32), xs.shape)
+    py = cy + r - (xs * sz).astype(np.int32)
+    alphas = rng.integers(100, 221, xs.size)
+    # One draw.point call per alpha level instead of one per point
+    order = np.argsort(alphas, kind="stable")
+    coords = np.column_stack((px.ravel(), py.ravel()))[order]
+    levels, starts = np.unique(alphas[order], return_index=True)
+    for a, pts in zip(levels.tolist(), np.split(coords, starts[1:])):
+        draw.point(pts.ravel().tolist(), fill=(*c1, a))
 
 
 def _draw_flow(draw, cx, cy, sz, c1, c2, seed=0):
     """Fluid dynamics: flow field streamlines."""
-    rng = random.Random(88 + seed)
+    rng = np.random.default_rng(88 + seed)
     r = sz // 2
-    for _ in range(25):
-        px = cx + rng.uniform(-r * 0.8, r * 0.8)
-        py = cy + rng.uniform(-r * 0.8, r * 0.8)
-        pts = [(px, py)]
-        for _ in range(30):
-            angle = math.sin(px * 0.03) * 2 + math.cos(py * 0.025) * 2.5
-            px += math.cos(angle) * 4
-            py += math.sin(angle) * 4
-            if math.dist((px, py), (cx, cy)) > r:
-                break
-            pts.append((px, py))
-        if len(pts) > 2:
-            alpha = rng.randint(90, 180)
-            for j in range(1, len(pts)):
-                draw.line([pts[j - 1], pts[j]], fill=(*c1, alpha), width=2)
+    n_lines, n_steps = 25, 30
+    # Euler-integrate every streamline in lockstep; a line stops at its first
+    # step outside the circle
+    px, py = rng.uniform(-r * 0.8, r * 0.8, (2, n_lines)) + ((cx,), (cy,))
+    xs, ys = [px], [py]
+    for _ in range(n_steps):
+        angle = np.sin(px * 0.03) * 2 + np.cos(py * 0.025) * 2.5
+        px = px + np.cos(angle) * 4
+        py = py + np.sin(angle) * 4
+        xs.append(px)
+        ys.append(py)
+    xs, ys = np.array(xs), np.array(ys)
+    outside = (xs - cx) ** 2 + (ys - cy) ** 2 > r * r
+    outside[0] = False
+    lengths = np.where(outside.any(axis=0), outside.argmax(axis=0), n_steps + 1).tolist()
+    alphas = rng.integers(90, 181, n_lines).tolist()
+    # One flat [x0, y0, x1, y1, ...] list per streamline
+    flat = np.stack((xs.T, ys.T), axis=2).reshape(n_lines, -1).tolist()
+    for pts, n, alpha in zip(flat, lengths, alphas):
+        if n > 2:
+            draw.line(pts[:2 * n], fill=(*c1, alpha), width=2, joint="curve")
 
 
 def _draw_distribution(draw, cx, cy, sz, c1, c2, seed=0):
     """Statistics: bell curve with histogram bars."""
     r = sz // 2
-    rng = random.Random(66 + seed)
     n_bars = 20
     bar_w = sz // n_bars
-    counts = [0] * n_bars
-    for _ in range(800):
-        v = rng.gauss(0.5, 0.15)
-        idx = int(v * n_bars)
-        if 0 <= idx < n_bars:
-            counts[idx] += 1
-    max_c = max(counts)
-    for i, c in enumerate(counts):
-        h = int((c / max_c) * r * 0.85)
+    samples = np.random.default_rng(66 + seed).normal(0.5, 0.15, 800)
+    counts, _ = np.histogram(samples, bins=n_bars, range=(0.0, 1.0))
+    max_c = counts.max()
+    for i, c in enumerate((counts / max_c).tolist()):
+        h = int(c * r * 0.85)
         bx = cx - r + i * bar_w
-        alpha = int(70 + 110 * (c / max_c))
+        alpha = int(70 + 110 * c)
         draw.rectangle([(bx + 1, cy + r // 2 - h), (bx + bar_w - 1, cy + r // 2)], fill=(*c1, alpha))
-    pts = []
-    for i in range(100):
-        t = i / 99
-        x = cx - r + t * sz
-        gauss_y = math.exp(-0.5 * ((t - 0.5) / 0.15) ** 2)
-        y = cy + r // 2 - int(gauss_y * r * 0.85)
-        pts.append((x, y))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 230), width=3)
+    xs = cx - r + _T100 * sz
+    ys = cy + r // 2 - (_GAUSS100 * r * 0.85).astype(np.int32)
+    draw.line(np.column_stack((xs, ys)).ravel().tolist(), fill=(*c1, 230), width=3, joint="curve")
 
 
 def _draw_tree(draw, cx, cy, sz, c1, c2, seed=0):
     """Decision tree / recursive branching."""
+    rng = random.Random(seed)  # one generator for the whole tree, not one per branch
+
     def branch(x, y, angle, length, depth):
         if depth <= 0 or length < 3:
             return
@@ -476,7 +670,7 @@ def _draw_tree(draw, cx, cy, sz, c1, c2, seed=0):
         ey = y - length * math.sin(angle)
         alpha = min(255, 70 + depth * 35)
         draw.line([(x, y), (ex, ey)], fill=(*c1, alpha), width=max(1, depth // 2 + 1))
-        spread = 0.45 + random.Random(int(x * 100 + y) + seed).uniform(-0.1, 0.1)
+        spread = 0.45 + rng.uniform(-0.1, 0.1)
         branch(ex, ey, angle + spread, length * 0.68, depth - 1)
         branch(ex, ey, angle - spread, length * 0.68, depth - 1)
     branch(cx, cy + sz // 3, math.pi / 2, sz * 0.28, 7)
@@ -484,16 +678,16 @@ def _draw_tree(draw, cx, cy, sz, c1, c2, seed=0):
 
 def _draw_matrix(draw, cx, cy, sz, c1, c2, seed=0):
     """Linear algebra: matrix heatmap with brackets."""
-    rng = random.Random(99 + seed)
+    rng = np.random.default_rng(99 + seed)
     r = sz // 2
     cell = 32
     rows, cols = 7, 7
     ox = cx - (cols * cell) // 2
     oy = cy - (rows * cell) // 2
+    alphas = (30 + rng.uniform(0, 1, (rows, cols)) * 150).astype(np.int32).tolist()
     for row in range(rows):
         for col in range(cols):
-            val = rng.uniform(0, 1)
-            alpha = int(30 + val * 150)
+            alpha = alphas[row][col]
             x, y = ox + col * cell, oy + row * cell
             draw.rectangle([(x + 1, y + 1), (x + cell - 2, y + cell - 2)], fill=(*c1, alpha))
     draw.line([(ox - 6, oy - 4), (ox - 6, oy + rows * cell + 2)], fill=(*c1, 120), width=3)
@@ -525,9 +719,9 @@ def _draw_pendulum(draw, cx, cy, sz, c1, c2, seed=0):
         ax = pivot_x + rod_len * math.sin(a)
         ay = pivot_y + rod_len * math.cos(a)
         arc_pts.append((ax, ay))
-    for j in range(1, len(arc_pts)):
-        if (j // 3) % 2 == 0:  # dashed
-            draw.line([arc_pts[j - 1], arc_pts[j]], fill=(*c1, 60), width=2)
+    # Dashed: three segments on, three off
+    for k in range(0, len(arc_pts), 6):
+        draw.line(arc_pts[max(k - 1, 0):k + 3], fill=(*c1, 60), width=2, joint="curve")
     # Draw each pendulum position (increasing opacity toward center)
     for idx, angle in enumerate(angles):
         bob_x = pivot_x + rod_len * math.sin(angle)
@@ -568,9 +762,9 @@ def _draw_contour(draw, cx, cy, sz, c1, c2, seed=0):
         dy = -(py - (cy - 20)) * 0.25 + rng.uniform(-3, 3)
         px, py = px + dx, py + dy
         pts.append((px, py))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 200), width=3)
-        draw.ellipse([(pts[j][0] - 3, pts[j][1] - 3), (pts[j][0] + 3, pts[j][1] + 3)], fill=(*c1, 220))
+    draw.line(pts, fill=(*c1, 200), width=3, joint="curve")
+    for px, py in pts[1:]:
+        draw.ellipse([(px - 3, py - 3), (px + 3, py + 3)], fill=(*c1, 220))
     draw.ellipse([(cx - 4, cy - 24), (cx + 4, cy - 16)], fill=(*c2, 255))
 
 
@@ -581,25 +775,21 @@ def _draw_helix(draw, cx, cy, sz, c1, c2, seed=0):
     rng = random.Random(42 + seed)
     r = sz // 2
     amp = r * 0.38
-    n_pts = 200
-    prev_a, prev_b = None, None
-    for t in range(n_pts):
-        frac = t / (n_pts - 1)
-        y = cy - r * 0.85 + int(frac * r * 1.7)
-        phase = frac * 5.5 * math.pi
-        x_a = cx + int(amp * math.sin(phase))
-        x_b = cx - int(amp * math.sin(phase))
-        depth_a = 0.5 + 0.5 * math.cos(phase)
+    phase = _T200 * 5.5 * math.pi
+    offs = (amp * np.sin(phase)).astype(np.int32)
+    ys = (cy - r * 0.85 + (_T200 * r * 1.7).astype(np.int32)).tolist()
+    xas, xbs = (cx + offs).tolist(), (cx - offs).tolist()
+    depths = 0.5 + 0.5 * np.cos(phase)
+    for t in range(0, 200, 12):
+        y, x_a, x_b = ys[t], xas[t], xbs[t]
+        depth_a = depths[t]
         depth_b = 1.0 - depth_a
-        if prev_a:
-            draw.line([prev_a, (x_a, y)], fill=(*c1, int(60 + 120 * depth_a)), width=2)
-            draw.line([prev_b, (x_b, y)], fill=(*c1, int(60 + 120 * depth_b)), width=2)
-        if t % 12 == 0:
-            rung_alpha = int(35 + 50 * min(depth_a, depth_b))
-            draw.line([(x_a, y), (x_b, y)], fill=(*c2, rung_alpha), width=1)
-            draw.ellipse([(x_a - 3, y - 3), (x_a + 3, y + 3)], fill=(*c1, int(120 * depth_a)))
-            draw.ellipse([(x_b - 3, y - 3), (x_b + 3, y + 3)], fill=(*c1, int(120 * depth_b)))
-        prev_a, prev_b = (x_a, y), (x_b, y)
+        rung_alpha = int(35 + 50 * min(depth_a, depth_b))
+        draw.line([(x_a, y), (x_b, y)], fill=(*c2, rung_alpha), width=1)
+        draw.ellipse([(x_a - 3, y - 3), (x_a + 3, y + 3)], fill=(*c1, int(120 * depth_a)))
+        draw.ellipse([(x_b - 3, y - 3), (x_b + 3, y + 3)], fill=(*c1, int(120 * depth_b)))
+    _draw_path(draw, list(zip(xas, ys)), c1, (60 + 120 * depths[1:]).astype(np.int32).tolist(), 2)
+    _draw_path(draw, list(zip(xbs, ys)), c1, (60 + 120 * (1.0 - depths[1:])).astype(np.int32).tolist(), 2)
 
 
 def _draw_circuit(draw, cx, cy, sz, c1, c2, seed=0):
@@ -624,52 +814,47 @@ def _draw_circuit(draw, cx, cy, sz, c1, c2, seed=0):
 
 def _draw_layers(draw, cx, cy, sz, c1, c2, seed=0):
     """Horizontal strata layers (geology, atmosphere)."""
-    rng = random.Random(55 + seed)
+    rng = np.random.default_rng(55 + seed)
     r = sz // 2
     n_layers = 6
+    t = np.arange(50)
+    xs = (cx - r + (t / 49 * sz).astype(np.int32)).tolist()
+    noise = rng.normal(0, 4, (n_layers, 50))
     for i in range(n_layers):
         y_base = cy - r + int((i + 0.5) * sz / n_layers)
         alpha = int(40 + 130 * (1 - i / n_layers))
-        pts = []
-        for t in range(50):
-            x = cx - r + int(t / 49 * sz)
-            y = y_base + int(rng.gauss(0, 4) + 8 * math.sin(t * 0.15 + i * 1.2))
-            pts.append((x, y))
-        for j in range(1, len(pts)):
-            draw.line([pts[j - 1], pts[j]], fill=(*c1, alpha), width=2)
+        ys = (y_base + (noise[i] + 8 * np.sin(t * 0.15 + i * 1.2)).astype(np.int32)).tolist()
+        draw.line(list(zip(xs, ys)), fill=(*c1, alpha), width=2, joint="curve")
 
 
 def _draw_fractal(draw, cx, cy, sz, c1, c2, seed=0):
     """Koch snowflake – light, airy fractal."""
     rng = random.Random(42 + seed)
     r = sz // 2
-    _depth_counter = [0]
-
-    def koch(x0, y0, x1, y1, depth):
+    scale = r * 0.8
+    t1 = (cx - scale, cy + scale * 0.5)
+    t2 = (cx + scale, cy + scale * 0.5)
+    t3 = (cx, cy - scale * 0.65)
+    # Expand the three sides with an explicit stack; children are pushed in
+    # reverse so leaves come out in curve order
+    stack = [(*t3, *t1, 4), (*t2, *t3, 4), (*t1, *t2, 4)]
+    leaves = []
+    while stack:
+        x0, y0, x1, y1, depth = stack.pop()
         if depth == 0:
-            # Vary alpha slightly for visual texture
-            _depth_counter[0] += 1
-            a = 100 + (_depth_counter[0] % 5) * 15
-            draw.line([(int(x0), int(y0)), (int(x1), int(y1))],
-                      fill=(*c1, a), width=1)
-            return
+            leaves.append((int(x0), int(y0), int(x1), int(y1)))
+            continue
         dx, dy = (x1 - x0) / 3, (y1 - y0) / 3
         ax, ay = x0 + dx, y0 + dy
         bx, by = x0 + 2 * dx, y0 + 2 * dy
         px = (ax + bx) / 2 - (by - ay) * 0.866
         py = (ay + by) / 2 + (bx - ax) * 0.866
-        koch(x0, y0, ax, ay, depth - 1)
-        koch(ax, ay, px, py, depth - 1)
-        koch(px, py, bx, by, depth - 1)
-        koch(bx, by, x1, y1, depth - 1)
-
-    scale = r * 0.8
-    t1 = (cx - scale, cy + scale * 0.5)
-    t2 = (cx + scale, cy + scale * 0.5)
-    t3 = (cx, cy - scale * 0.65)
-    koch(t1[0], t1[1], t2[0], t2[1], 4)
-    koch(t2[0], t2[1], t3[0], t3[1], 4)
-    koch(t3[0], t3[1], t1[0], t1[1], 4)
+        d = depth - 1
+        stack += [(bx, by, x1, y1, d), (px, py, bx, by, d), (ax, ay, px, py, d), (x0, y0, ax, ay, d)]
+    for n, (x0, y0, x1, y1) in enumerate(leaves, 1):
+        # Vary alpha slightly for visual texture
+        a = 100 + (n % 5) * 15
+        draw.line([(x0, y0), (x1, y1)], fill=(*c1, a), width=1)
 
 
 def _draw_cycle(draw, cx, cy, sz, c1, c2, seed=0):
@@ -705,81 +890,77 @@ def _draw_spectrum(draw, cx, cy, sz, c1, c2, seed=0):
     r = sz // 2
     n_bars = 28
     bar_w = int(sz * 0.8 / n_bars)
-    for i in range(n_bars):
-        x = cx - int(sz * 0.4) + i * bar_w
-        h = int(rng.uniform(0.15, 0.85) * r)
+    heights = [int(rng.uniform(0.15, 0.85) * r) for _ in range(n_bars)]
+    x0, base = cx - int(sz * 0.4), cy + r * 0.4
+    for i, h in enumerate(heights):
+        x = x0 + i * bar_w
         alpha = int(80 + 120 * (h / r))
-        draw.rectangle([(x, cy + r * 0.4 - h), (x + bar_w - 2, cy + r * 0.4)], fill=(*c1, alpha))
-    # Envelope curve
-    pts = []
-    for i in range(n_bars):
-        x = cx - int(sz * 0.4) + i * bar_w + bar_w // 2
-        h = int(rng.uniform(0.15, 0.85) * r)
-        pts.append((x, cy + r * 0.4 - h - 5))
+        draw.rectangle([(x, base - h), (x + bar_w - 2, base)], fill=(*c1, alpha))
 
 
 def _draw_lattice(draw, cx, cy, sz, c1, c2, seed=0):
     """Square lattice with connections."""
-    rng = random.Random(42 + seed)
     r = sz // 2
     step = int(r * 0.33)
-    for gx in range(-3, 4):
-        for gy in range(-3, 4):
-            px, py = cx + gx * step, cy + gy * step
-            if math.dist((px, py), (cx, cy)) > r * 0.95:
-                continue
-            alpha = max(60, int(180 - math.dist((px, py), (cx, cy)) * 0.6))
-            draw.ellipse([(px - 4, py - 4), (px + 4, py + 4)], fill=(*c1, alpha))
-            if gx < 3:
-                nx = cx + (gx + 1) * step
-                if math.dist((nx, py), (cx, cy)) <= r * 0.95:
-                    draw.line([(px, py), (nx, py)], fill=(*c1, alpha - 40), width=1)
-            if gy < 3:
-                ny = cy + (gy + 1) * step
-                if math.dist((px, ny), (cx, cy)) <= r * 0.95:
-                    draw.line([(px, py), (px, ny)], fill=(*c1, alpha - 40), width=1)
+    max_d2 = (r * 0.95) ** 2
+    # Cull the 7x7 grid in one pass: node, right link and down link masks
+    g = np.arange(-3, 4) * step
+    ox, oy = np.meshgrid(g, g, indexing="ij")
+    d2 = ox * ox + oy * oy
+    keep = d2 <= max_d2
+    right = (ox + step) ** 2 + oy * oy <= max_d2
+    right[-1] = False
+    down = ox * ox + (oy + step) ** 2 <= max_d2
+    down[:, -1] = False
+    alphas = np.maximum(60, (180 - np.sqrt(d2) * 0.6).astype(np.int32))
+    nodes = zip((cx + ox[keep]).tolist(), (cy + oy[keep]).tolist(), alphas[keep].tolist(),
+                right[keep].tolist(), down[keep].tolist())
+    line, ellipse = draw.line, draw.ellipse  # locals for the node loop
+    for px, py, alpha, link_right, link_down in nodes:
+        ellipse([(px - 4, py - 4), (px + 4, py + 4)], fill=(*c1, alpha))
+        if link_right:
+            line([(px, py), (px + step, py)], fill=(*c1, alpha - 40), width=1)
+        if link_down:
+            line([(px, py), (px, py + step)], fill=(*c1, alpha - 40), width=1)
 
 
 def _draw_topology(draw, cx, cy, sz, c1, c2, seed=0):
     """Deformed loops / Möbius-like curves."""
     rng = random.Random(77 + seed)
     r = sz // 2
+    sin1, cos1 = _trig(80)
+    sin2, cos3 = _trig(80, 2)[0], _trig(80, 3)[1]
     for loop in range(3):
         lr = r * (0.25 + loop * 0.2) + rng.uniform(-10, 10)
         offset_x = rng.uniform(-r * 0.15, r * 0.15)
         offset_y = rng.uniform(-r * 0.15, r * 0.15)
         deform = rng.uniform(0.3, 0.7)
         alpha = int(80 + 60 * (2 - loop))
-        pts = []
-        for t in range(80):
-            a = 2 * math.pi * t / 79
-            dx = lr * math.cos(a) * (1 + deform * math.sin(2 * a))
-            dy = lr * math.sin(a) * (1 + deform * math.cos(3 * a))
-            pts.append((cx + offset_x + int(dx), cy + offset_y + int(dy)))
-        for j in range(1, len(pts)):
-            draw.line([pts[j - 1], pts[j]], fill=(*c1, alpha), width=2)
-        draw.line([pts[-1], pts[0]], fill=(*c1, alpha), width=2)
+        dx = (lr * cos1 * (1 + deform * sin2)).astype(np.int32)
+        dy = (lr * sin1 * (1 + deform * cos3)).astype(np.int32)
+        pts = list(zip((cx + offset_x + dx).tolist(), (cy + offset_y + dy).tolist()))
+        draw.line(pts + pts[:1], fill=(*c1, alpha), width=2, joint="curve")
 
 
 def _draw_constellation(draw, cx, cy, sz, c1, c2, seed=0):
     """Star field with constellation lines."""
-    rng = random.Random(99 + seed)
+    rng = np.random.default_rng(99 + seed)
     r = sz // 2
-    stars = [(cx + rng.randint(-r, r), cy + rng.randint(-r, r)) for _ in range(30)]
+    star_xy = rng.integers(-r, r + 1, (30, 2)) + (cx, cy)
+    stars = [tuple(p) for p in star_xy.tolist()]
     bright = stars[:8]
     # Dim stars
-    for sx, sy in stars[8:]:
-        size = rng.uniform(1, 3)
-        draw.ellipse([(sx - size, sy - size), (sx + size, sy + size)], fill=(*c2, rng.randint(50, 100)))
+    dim_alpha = rng.integers(50, 101, 22).tolist()
+    _draw_disks(draw, star_xy[8:, 0], star_xy[8:, 1], rng.uniform(1, 3, 22), [(*c2, a) for a in dim_alpha])
     # Constellation lines
-    for i in range(len(bright) - 1):
-        d = math.dist(bright[i], bright[i + 1])
-        if d < r * 0.8:
-            draw.line([bright[i], bright[i + 1]], fill=(*c1, 80), width=1)
+    max_d2 = (r * 0.8) ** 2
+    line = draw.line  # local for the link loop
+    for (x0, y0), (x1, y1) in zip(bright, bright[1:]):
+        if (x1 - x0) ** 2 + (y1 - y0) ** 2 < max_d2:
+            line([(x0, y0), (x1, y1)], fill=(*c1, 80), width=1)
     # Bright stars
-    for sx, sy in bright:
-        size = rng.uniform(4, 8)
-        draw.ellipse([(sx - size, sy - size), (sx + size, sy + size)], fill=(*c1, rng.randint(150, 220)))
+    bright_alpha = rng.integers(150, 221, 8).tolist()
+    _draw_disks(draw, star_xy[:8, 0], star_xy[:8, 1], rng.uniform(4, 8, 8), [(*c1, a) for a in bright_alpha])
 
 
 def _draw_lens(draw, cx, cy, sz, c1, c2, seed=0):
@@ -812,8 +993,7 @@ def _draw_membrane(draw, cx, cy, sz, c1, c2, seed=0):
             x = cx - r * 0.85 + t * (r * 1.7 / 69)
             y = y_base + 8 * math.sin(t * 0.18 + layer * 0.5)
             pts.append((x, y))
-        for j in range(1, len(pts)):
-            draw.line([pts[j - 1], pts[j]], fill=(*c1, 160), width=2)
+        draw.line(pts, fill=(*c1, 160), width=2, joint="curve")
     # Lipid tails – short lines perpendicular to membrane, pointing inward
     for t in range(3, 70, 4):
         x = cx - r * 0.85 + t * (r * 1.7 / 69)
@@ -838,8 +1018,7 @@ def _draw_gear(draw, cx, cy, sz, c1, c2, seed=0):
             a = 2 * math.pi * i / (teeth * 2) + phase
             rr = gr if i % 2 == 0 else gr * 0.78
             pts.append((gx + int(rr * math.cos(a)), gy + int(rr * math.sin(a))))
-        for i in range(len(pts)):
-            draw.line([pts[i], pts[(i + 1) % len(pts)]], fill=(*c1, alpha), width=2)
+        draw.line(pts + pts[:1], fill=(*c1, alpha), width=2, joint="curve")
         # Hub circle only
         hub_r = gr * 0.2
         draw.ellipse([(gx - hub_r, gy - hub_r), (gx + hub_r, gy + hub_r)],
@@ -871,14 +1050,12 @@ def _draw_axis(draw, cx, cy, sz, c1, c2, seed=0):
     rng = random.Random(42 + seed)
     r = sz // 2
     ox, oy = cx - r * 0.6, cy + r * 0.5
-    # Axes
-    draw.line([(ox, oy), (ox + r * 1.3, oy)], fill=(*c1, 120), width=2)
-    draw.line([(ox, oy), (ox, oy - r * 1.1)], fill=(*c1, 120), width=2)
-    # Arrow tips
-    draw.line([(ox + r * 1.25, oy - 4), (ox + r * 1.3, oy)], fill=(*c1, 120), width=2)
-    draw.line([(ox + r * 1.25, oy + 4), (ox + r * 1.3, oy)], fill=(*c1, 120), width=2)
-    draw.line([(ox - 4, oy - r * 1.05), (ox, oy - r * 1.1)], fill=(*c1, 120), width=2)
-    draw.line([(ox + 4, oy - r * 1.05), (ox, oy - r * 1.1)], fill=(*c1, 120), width=2)
+    # Axes, then each arrow tip as a single chevron
+    x_tip, y_tip = (ox + r * 1.3, oy), (ox, oy - r * 1.1)
+    draw.line([(ox, oy), x_tip], fill=(*c1, 120), width=2)
+    draw.line([(ox, oy), y_tip], fill=(*c1, 120), width=2)
+    draw.line([(ox + r * 1.25, oy - 4), x_tip, (ox + r * 1.25, oy + 4)], fill=(*c1, 120), width=2)
+    draw.line([(ox - 4, oy - r * 1.05), y_tip, (ox + 4, oy - r * 1.05)], fill=(*c1, 120), width=2)
     # Curve
     func_seed = rng.uniform(0.5, 2.0)
     pts = []
@@ -887,8 +1064,7 @@ def _draw_axis(draw, cx, cy, sz, c1, c2, seed=0):
         frac = t / 59
         y = oy - r * 0.8 * (math.sin(frac * math.pi * func_seed) ** 2) * (1 - 0.3 * frac)
         pts.append((x, y))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 180), width=3)
+    draw.line(pts, fill=(*c1, 180), width=3, joint="curve")
     # Scatter points along curve
     for t in range(0, 60, 8):
         x, y = pts[t]
@@ -922,8 +1098,7 @@ def _draw_radioactive(draw, cx, cy, sz, c1, c2, seed=0):
         x = cx - r * 0.7 + frac * r * 1.4
         y = cy + r * 0.4 - r * 0.8 * math.exp(-3 * frac)
         pts.append((x, y))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 140), width=2)
+    draw.line(pts, fill=(*c1, 140), width=2, joint="curve")
     # Emitted rays
     for i in range(7):
         t = rng.randint(8, 65)
@@ -944,22 +1119,21 @@ def _draw_electrode(draw, cx, cy, sz, c1, c2, seed=0):
     for sign in [-1, 1]:
         px = cx + sign * int(gap / 2)
         draw.line([(px, cy - plate_h), (px, cy + plate_h)], fill=(*c1, 180), width=3)
-    # + and - charges
+    # + and - charges, stroked directly (the default font has no "−" glyph)
     for _ in range(8):
         y = rng.uniform(cy - plate_h * 0.8, cy + plate_h * 0.8)
         # Positive (left plate)
         px = cx - gap // 2 - rng.uniform(5, 25)
-        draw.text((px - 4, y - 6), "+", fill=(*c1, 140), font=None)
+        _plus(draw, px, y, (*c1, 140))
         # Negative (right plate)
         px = cx + gap // 2 + rng.uniform(5, 25)
-        draw.text((px - 4, y - 6), "−", fill=(*c1, 140), font=None)
+        _minus(draw, px, y, (*c1, 140))
     # Field lines
     for i in range(5):
         y = cy - plate_h * 0.6 + i * (plate_h * 1.2 / 4)
         draw.line([(cx - gap // 2 + 5, y), (cx + gap // 2 - 5, y)], fill=(*c1, 60), width=1)
         # Arrow
-        draw.line([(cx + 5, y), (cx, y - 3)], fill=(*c1, 80), width=1)
-        draw.line([(cx + 5, y), (cx, y + 3)], fill=(*c1, 80), width=1)
+        draw.line([(cx, y - 3), (cx + 5, y), (cx, y + 3)], fill=(*c1, 80), width=1)
 
 
 def _draw_spring(draw, cx, cy, sz, c1, c2, seed=0):
@@ -978,15 +1152,14 @@ def _draw_spring(draw, cx, cy, sz, c1, c2, seed=0):
         y = cy + amp * (1 if i % 2 == 0 else -1)
         pts.append((x, y))
     pts.append((cx + r * 0.4, cy))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 150), width=2)
+    draw.line(pts, fill=(*c1, 150), width=2, joint="curve")
     # Mass block
     bx = cx + r * 0.4
     draw.rectangle([(bx, cy - 18), (bx + 36, cy + 18)], outline=(*c1, 180), width=2)
-    # Arrow showing motion
-    draw.line([(bx + 50, cy), (bx + 75, cy)], fill=(*c1, 100), width=2)
-    draw.line([(bx + 70, cy - 4), (bx + 75, cy)], fill=(*c1, 100), width=2)
-    draw.line([(bx + 70, cy + 4), (bx + 75, cy)], fill=(*c1, 100), width=2)
+    # Arrow showing motion: shaft, then the head as one chevron
+    tip = (bx + 75, cy)
+    draw.line([(bx + 50, cy), tip], fill=(*c1, 100), width=2)
+    draw.line([(bx + 70, cy - 4), tip, (bx + 70, cy + 4)], fill=(*c1, 100), width=2)
 
 
 def _draw_prism(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1017,34 +1190,29 @@ def _draw_interference(draw, cx, cy, sz, c1, c2, seed=0):
     # Sources offset, rings constrained to panel
     s1 = (cx - r * 0.32, cy + r * 0.05)
     s2 = (cx + r * 0.32, cy - r * 0.05)
-    for src in [s1, s2]:
-        for i in range(1, 8):
-            cr = i * r * 0.11
-            alpha = max(30, 110 - i * 10)
-            draw.ellipse([(src[0] - cr, src[1] - cr), (src[0] + cr, src[1] + cr)],
-                         outline=(*c1, alpha), width=1)
+    rings = [(i * r * 0.11, (*c1, max(30, 110 - i * 10))) for i in range(1, 8)]
+    for sx, sy in (s1, s2):
+        for cr, color in rings:
+            draw.ellipse((sx - cr, sy - cr, sx + cr, sy + cr), outline=color, width=1)
 
 
 def _draw_diffusion(draw, cx, cy, sz, c1, c2, seed=0):
     """Concentration gradient: dense to sparse."""
-    rng = random.Random(42 + seed)
+    rng = np.random.default_rng(42 + seed)
     r = sz // 2
-    for _ in range(100):
-        x = rng.gauss(-r * 0.3, r * 0.35)
-        y = rng.uniform(-r * 0.8, r * 0.8)
-        if abs(x) > r or abs(y) > r:
-            continue
-        # Density decreases left to right
-        density = max(0, 1 - (x + r) / (2 * r))
-        if rng.random() > density * 1.5:
-            continue
-        size = rng.uniform(3, 6)
-        alpha = int(60 + 140 * density)
-        draw.ellipse([(cx + x - size, cy + y - size), (cx + x + size, cy + y + size)], fill=(*c1, alpha))
-    # Gradient arrow
-    draw.line([(cx - r * 0.7, cy + r * 0.7), (cx + r * 0.7, cy + r * 0.7)], fill=(*c1, 80), width=2)
-    draw.line([(cx + r * 0.65, cy + r * 0.66), (cx + r * 0.7, cy + r * 0.7)], fill=(*c1, 80), width=2)
-    draw.line([(cx + r * 0.65, cy + r * 0.74), (cx + r * 0.7, cy + r * 0.7)], fill=(*c1, 80), width=2)
+    x = rng.normal(-r * 0.3, r * 0.35, 100)
+    y = rng.uniform(-r * 0.8, r * 0.8, 100)
+    keep_draw = rng.random(100)
+    sizes = rng.uniform(3, 6, 100)
+    # Density decreases left to right
+    density = np.maximum(0, 1 - (x + r) / (2 * r))
+    keep = (np.abs(x) <= r) & (np.abs(y) <= r) & (keep_draw <= density * 1.5)
+    alphas = (60 + 140 * density[keep]).astype(np.int32)
+    _draw_disks(draw, cx + x[keep], cy + y[keep], sizes[keep], [(*c1, a) for a in alphas.tolist()])
+    # Gradient arrow: shaft, then the head as one chevron
+    tip = (cx + r * 0.7, cy + r * 0.7)
+    draw.line([(cx - r * 0.7, cy + r * 0.7), tip], fill=(*c1, 80), width=2)
+    draw.line([(cx + r * 0.65, cy + r * 0.66), tip, (cx + r * 0.65, cy + r * 0.74)], fill=(*c1, 80), width=2)
 
 
 def _draw_bond(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1053,25 +1221,27 @@ def _draw_bond(draw, cx, cy, sz, c1, c2, seed=0):
     r = sz // 2
     atoms = [(cx + rng.randint(-int(r * 0.6), int(r * 0.6)),
               cy + rng.randint(-int(r * 0.6), int(r * 0.6))) for _ in range(6)]
+    line, ellipse, sqrt, choice = draw.line, draw.ellipse, math.sqrt, rng.choice  # locals for the loops
     # Bonds
     for i in range(len(atoms)):
         j = (i + 1) % len(atoms)
         x0, y0 = atoms[i]
         x1, y1 = atoms[j]
-        d = math.dist(atoms[i], atoms[j])
-        if d > r:
+        d2 = (x1 - x0) ** 2 + (y1 - y0) ** 2
+        if d2 > r * r:
             continue
-        n_lines = rng.choice([1, 2, 3])
+        d = sqrt(d2)
+        n_lines = choice([1, 2, 3])
         perp_x, perp_y = -(y1 - y0) / max(d, 1) * 4, (x1 - x0) / max(d, 1) * 4
         for b in range(n_lines):
             off = (b - (n_lines - 1) / 2)
-            draw.line([(x0 + perp_x * off, y0 + perp_y * off),
-                       (x1 + perp_x * off, y1 + perp_y * off)], fill=(*c1, 130), width=2)
+            line([(x0 + perp_x * off, y0 + perp_y * off),
+                  (x1 + perp_x * off, y1 + perp_y * off)], fill=(*c1, 130), width=2)
     # Atoms
     for ax, ay in atoms:
         ar = rng.uniform(10, 18)
-        draw.ellipse([(ax - ar, ay - ar), (ax + ar, ay + ar)], outline=(*c1, 160), width=2)
-        draw.ellipse([(ax - 4, ay - 4), (ax + 4, ay + 4)], fill=(*c1, 140))
+        ellipse([(ax - ar, ay - ar), (ax + ar, ay + ar)], outline=(*c1, 160), width=2)
+        ellipse([(ax - 4, ay - 4), (ax + 4, ay + 4)], fill=(*c1, 140))
 
 
 def _draw_oscillator(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1083,25 +1253,14 @@ def _draw_oscillator(draw, cx, cy, sz, c1, c2, seed=0):
     # Axis
     draw.line([(cx - r * 0.85, cy), (cx + r * 0.85, cy)], fill=(*c1, 60), width=1)
     # Waveform
-    pts = []
-    for t in range(120):
-        frac = t / 119
-        x = cx - r * 0.8 + frac * r * 1.6
-        amp = r * 0.5 * math.exp(-decay * frac)
-        y = cy - amp * math.sin(freq * 2 * math.pi * frac)
-        pts.append((x, y))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 180), width=3)
+    frac = np.arange(120) / 119
+    xs = (cx - r * 0.8 + frac * r * 1.6).tolist()
+    amp = r * 0.5 * np.exp(-decay * frac)
+    pts = list(zip(xs, (cy - amp * np.sin(freq * 2 * np.pi * frac)).tolist()))
+    draw.line(pts, fill=(*c1, 180), width=3, joint="curve")
     # Envelope
     for sign in [1, -1]:
-        env = []
-        for t in range(120):
-            frac = t / 119
-            x = cx - r * 0.8 + frac * r * 1.6
-            amp = r * 0.5 * math.exp(-decay * frac)
-            env.append((x, cy - sign * amp))
-        for j in range(1, len(env)):
-            draw.line([env[j - 1], env[j]], fill=(*c2, 60), width=1)
+        draw.line(list(zip(xs, (cy - sign * amp).tolist())), fill=(*c2, 60), width=1)
 
 
 def _draw_parabola(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1111,14 +1270,11 @@ def _draw_parabola(draw, cx, cy, sz, c1, c2, seed=0):
     # Ground line
     draw.line([(cx - r * 0.85, cy + r * 0.4), (cx + r * 0.85, cy + r * 0.4)], fill=(*c2, 60), width=1)
     # Trajectory
-    pts = []
-    for t in range(80):
-        frac = t / 79
-        x = cx - r * 0.7 + frac * r * 1.4
-        y = cy + r * 0.4 - r * 0.9 * (4 * frac * (1 - frac))
-        pts.append((x, y))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 180), width=3)
+    frac = np.arange(80) / 79
+    xs = cx - r * 0.7 + frac * r * 1.4
+    ys = cy + r * 0.4 - r * 0.9 * (4 * frac * (1 - frac))
+    pts = list(zip(xs.tolist(), ys.tolist()))
+    draw.line(pts, fill=(*c1, 180), width=3, joint="curve")
     # Dots along trajectory
     for t in range(0, 80, 10):
         x, y = pts[t]
@@ -1136,32 +1292,29 @@ def _draw_tessellation(draw, cx, cy, sz, c1, c2, seed=0):
     rng = random.Random(42 + seed)
     r = sz // 2
     cell = int(r * 0.28)
+    h = cell // 2
     shape = rng.choice(["triangle", "diamond"])
-    for row in range(-4, 5):
-        for col in range(-4, 5):
-            if shape == "triangle":
-                bx = cx + col * cell + (row % 2) * cell // 2
-                by = cy + int(row * cell * 0.86)
-                if math.dist((bx, by), (cx, cy)) > r:
-                    continue
-                alpha = max(40, int(150 - math.dist((bx, by), (cx, cy)) * 0.5))
-                up = (row + col) % 2 == 0
-                if up:
-                    pts = [(bx, by - cell // 2), (bx - cell // 2, by + cell // 2), (bx + cell // 2, by + cell // 2)]
-                else:
-                    pts = [(bx - cell // 2, by - cell // 2), (bx + cell // 2, by - cell // 2), (bx, by + cell // 2)]
-                for i in range(3):
-                    draw.line([pts[i], pts[(i + 1) % 3]], fill=(*c1, alpha), width=1)
+    # Cell centres for the whole 9x9 grid, culled to the circle in one pass
+    row, col = np.meshgrid(np.arange(-4, 5), np.arange(-4, 5), indexing="ij")
+    bxs = cx + col * cell + (row % 2) * cell // 2
+    if shape == "triangle":
+        bys = cy + (row * cell * 0.86).astype(np.int32)
+    else:
+        bys = cy + row * cell
+    d2 = (bxs - cx) ** 2 + (bys - cy) ** 2
+    alphas = np.maximum(40, (150 - np.sqrt(d2) * 0.5).astype(np.int32))
+    keep = d2 <= r * r
+    cells = zip(bxs[keep].tolist(), bys[keep].tolist(), alphas[keep].tolist(), ((row + col)[keep] % 2 == 0).tolist())
+    line = draw.line  # local for the cell loop
+    for bx, by, alpha, up in cells:
+        if shape == "triangle":
+            if up:
+                pts = [(bx, by - h), (bx - h, by + h), (bx + h, by + h)]
             else:
-                bx = cx + col * cell + (row % 2) * cell // 2
-                by = cy + row * cell
-                if math.dist((bx, by), (cx, cy)) > r:
-                    continue
-                alpha = max(40, int(150 - math.dist((bx, by), (cx, cy)) * 0.5))
-                h = cell // 2
-                pts = [(bx, by - h), (bx + h, by), (bx, by + h), (bx - h, by)]
-                for i in range(4):
-                    draw.line([pts[i], pts[(i + 1) % 4]], fill=(*c1, alpha), width=1)
+                pts = [(bx - h, by - h), (bx + h, by - h), (bx, by + h)]
+        else:
+            pts = [(bx, by - h), (bx + h, by), (bx, by + h), (bx - h, by)]
+        line(pts + pts[:1], fill=(*c1, alpha), width=1)
 
 
 def _draw_pipeline(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1227,8 +1380,7 @@ def _draw_dipole(draw, cx, cy, sz, c1, c2, seed=0):
             x = p1[0] + frac * (p2[0] - p1[0])
             y = cy + bulge * math.sin(frac * math.pi)
             pts.append((x, y))
-        for j in range(1, len(pts)):
-            draw.line([pts[j - 1], pts[j]], fill=(*c1, 80 + abs(i) * 10), width=2)
+        draw.line(pts, fill=(*c1, 80 + abs(i) * 10), width=2, joint="curve")
 
 
 def _draw_pulse(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1251,8 +1403,7 @@ def _draw_pulse(draw, cx, cy, sz, c1, c2, seed=0):
         pts.append((base_x + seg * 0.35 + w, cy + h * 0.15))
         pts.append((base_x + seg * 0.55, cy))
     pts.append((cx + r * 0.8, cy))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 180), width=2)
+    draw.line(pts, fill=(*c1, 180), width=2, joint="curve")
 
 
 def _draw_bridge(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1264,20 +1415,15 @@ def _draw_bridge(draw, cx, cy, sz, c1, c2, seed=0):
     # Deck line
     draw.line([(x_left, y_deck), (x_right, y_deck)], fill=(*c1, 140), width=2)
     # Parabolic arch
-    arch_pts = []
-    for i in range(60):
-        frac = i / 59
-        x = x_left + frac * (x_right - x_left)
-        y = y_deck - r * 0.75 * (1 - (2 * frac - 1) ** 2)
-        arch_pts.append((x, y))
-    for j in range(1, len(arch_pts)):
-        draw.line([arch_pts[j - 1], arch_pts[j]], fill=(*c1, 130), width=2)
+    def arch(frac):
+        return x_left + frac * (x_right - x_left), y_deck - r * 0.75 * (1 - (2 * frac - 1) ** 2)
+
+    xs, ys = arch(np.arange(60) / 59)
+    draw.line(list(zip(xs.tolist(), ys.tolist())), fill=(*c1, 130), width=2, joint="curve")
     # Vertical hangers – thin
     n_hangers = 8
-    for i in range(n_hangers):
-        frac = (i + 1) / (n_hangers + 1)
-        x = x_left + frac * (x_right - x_left)
-        y_arch = y_deck - r * 0.75 * (1 - (2 * frac - 1) ** 2)
+    xs, ys = arch(np.arange(1, n_hangers + 1) / (n_hangers + 1))
+    for x, y_arch in zip(xs.tolist(), ys.tolist()):
         draw.line([(x, y_arch), (x, y_deck)], fill=(*c1, 70), width=1)
     # Tiny support marks
     for px in [x_left, x_right]:
@@ -1299,36 +1445,46 @@ def _draw_polar(draw, cx, cy, sz, c1, c2, seed=0):
         draw.line([(cx, cy), (cx + int(r * 0.75 * math.cos(rad)), cy + int(r * 0.75 * math.sin(rad)))],
                   fill=(*c2, 30), width=1)
     # Rose curve
-    pts = []
-    for t in range(360):
-        a = math.radians(t)
-        rr = r * 0.7 * abs(math.cos(petals * a / 2))
-        pts.append((cx + int(rr * math.cos(a)), cy + int(rr * math.sin(a))))
-    for j in range(1, len(pts)):
-        draw.line([pts[j - 1], pts[j]], fill=(*c1, 160), width=2)
+    draw.line(_rose_points(cx, cy, r * 0.7, petals), fill=(*c1, 160), width=2, joint="curve")
+
+
+@functools.lru_cache(maxsize=16)
+def _rose_points(cx, cy, radius, petals):
+    """One-degree samples of a rose curve; only `petals` varies between cards."""
+    a = np.radians(np.arange(360))
+    rr = radius * np.abs(np.cos(petals * a / 2))
+    return tuple(zip((cx + (rr * np.cos(a)).astype(np.int32)).tolist(),
+                     (cy + (rr * np.sin(a)).astype(np.int32)).tolist()))
+
+
+@functools.lru_cache(maxsize=4)
+def _knot_runs(cx, cy, scale, n_pts):
+    """Trefoil polylines split by crossing depth: (back runs, front runs).
+
+    The knot has no random parts, so this runs once per size. Segment j
+    (pts[j] → pts[j + 1]) is in front when sin(3a) >= 0 at its end point.
+    """
+    (sin1, cos1), (sin2, cos2) = _trig(n_pts), _trig(n_pts, 2)
+    x = cx + ((sin1 + 2 * sin2) * scale).astype(np.int32)
+    y = cy + ((cos1 - 2 * cos2) * scale).astype(np.int32)
+    pts = list(zip(x.tolist(), y.tolist()))
+    front = _trig(n_pts, 3)[0][1:] >= 0
+    bounds = [0, *(np.flatnonzero(front[1:] != front[:-1]) + 1).tolist(), n_pts - 1]
+    back_runs, front_runs = [], []
+    for lo, hi in zip(bounds, bounds[1:]):
+        (front_runs if front[lo] else back_runs).append(tuple(pts[lo:hi + 1]))
+    return tuple(back_runs), tuple(front_runs)
 
 
 def _draw_knot(draw, cx, cy, sz, c1, c2, seed=0):
     """Trefoil knot – elegant with depth crossings."""
-    rng = random.Random(42 + seed)
     r = sz // 2
-    scale = r * 0.26
-    n_pts = 250
-    pts = []
-    depths = []
-    for t in range(n_pts):
-        a = 2 * math.pi * t / (n_pts - 1)
-        x = math.sin(a) + 2 * math.sin(2 * a)
-        y = math.cos(a) - 2 * math.cos(2 * a)
-        pts.append((cx + int(x * scale), cy + int(y * scale)))
-        depths.append(math.sin(3 * a))
+    back, front = _knot_runs(cx, cy, r * 0.26, 250)
     # Two-pass: back dim, front bright
-    for j in range(1, n_pts):
-        if depths[j] < 0:
-            draw.line([pts[j - 1], pts[j]], fill=(*c1, 55), width=2)
-    for j in range(1, n_pts):
-        if depths[j] >= 0:
-            draw.line([pts[j - 1], pts[j]], fill=(*c1, 150), width=2)
+    for run in back:
+        draw.line(run, fill=(*c1, 55), width=2, joint="curve")
+    for run in front:
+        draw.line(run, fill=(*c1, 150), width=2, joint="curve")
 
 
 def _draw_cascade_steps(draw, cx, cy, sz, c1, c2, seed=0):
@@ -1366,39 +1522,38 @@ def _draw_symmetry(draw, cx, cy, sz, c1, c2, seed=0):
         d = rng.uniform(r * 0.1, r * 0.7)
         a = rng.uniform(0, 2 * math.pi / n_fold)
         sector_pts.append((d, a))
+    d, a = np.array(sector_pts).T
+    # Every rotated copy at once: row k is the sector turned by k folds
+    ta = a + (np.arange(n_fold) * (2 * math.pi / n_fold))[:, None]
+    xs = (cx + (d * np.cos(ta)).astype(np.int32)).tolist()
+    ys = (cy + (d * np.sin(ta)).astype(np.int32)).tolist()
     for k in range(n_fold):
-        rot = k * (2 * math.pi / n_fold)
         alpha = 100 + (k * 15) % 60
-        transformed = []
-        for d, a in sector_pts:
-            ta = a + rot
-            transformed.append((cx + int(d * math.cos(ta)), cy + int(d * math.sin(ta))))
-        for j in range(1, len(transformed)):
-            draw.line([transformed[j - 1], transformed[j]], fill=(*c1, alpha), width=2)
+        transformed = list(zip(xs[k], ys[k]))
+        draw.line(transformed, fill=(*c1, alpha), width=2, joint="curve")
         if len(transformed) > 2:
             draw.line([transformed[-1], transformed[0]], fill=(*c1, alpha - 30), width=1)
 
 
 def _draw_cloud(draw, cx, cy, sz, c1, c2, seed=0):
     """Wispy overlapping arcs – nebula / probability cloud."""
-    rng = random.Random(42 + seed)
+    rng = np.random.default_rng(42 + seed)
     r = sz // 2
-    for _ in range(18):
-        # Each wisp is a smooth arc
-        acx = cx + rng.uniform(-r * 0.35, r * 0.35)
-        acy = cy + rng.uniform(-r * 0.35, r * 0.35)
-        arc_r = rng.uniform(r * 0.2, r * 0.55)
-        start_a = rng.uniform(0, 2 * math.pi)
-        sweep = rng.uniform(0.8, 2.2)
-        alpha = rng.randint(40, 110)
-        pts = []
-        for t in range(30):
-            a = start_a + sweep * t / 29
-            px = acx + arc_r * math.cos(a)
-            py = acy + arc_r * math.sin(a)
-            pts.append((px, py))
-        for j in range(1, len(pts)):
-            draw.line([pts[j - 1], pts[j]], fill=(*c1, alpha), width=1)
+    n = 18
+    # Each wisp is a smooth arc; sample all 18 at once
+    acx = cx + rng.uniform(-r * 0.35, r * 0.35, n)
+    acy = cy + rng.uniform(-r * 0.35, r * 0.35, n)
+    arc_r = rng.uniform(r * 0.2, r * 0.55, n)
+    start_a = rng.uniform(0, 2 * math.pi, n)
+    sweep = rng.uniform(0.8, 2.2, n)
+    alphas = rng.integers(40, 111, n).tolist()
+    # A 30-point polyline per wisp; measured ~4x cheaper than draw.arc, whose
+    # rasterizer scans the full ellipse bbox
+    a = start_a[:, None] + sweep[:, None] * (np.arange(30) / 29)
+    pxs = acx[:, None] + arc_r[:, None] * np.cos(a)
+    pys = acy[:, None] + arc_r[:, None] * np.sin(a)
+    for xs, ys, alpha in zip(pxs.tolist(), pys.tolist(), alphas):
+        draw.line(list(zip(xs, ys)), fill=(*c1, alpha), width=1)
 
 
 # ── Generative Primitive Art (semantic-driven) ─────────────
@@ -1425,11 +1580,15 @@ _GEN_DEFAULTS = {
 
 _DENSITY_COUNT = {"dense": 60, "medium": 35, "sparse": 15}
 
+# Unit-circle vertices of the regular polygons the "polygons" primitive draws
+_POLY_UNIT = {s: [(math.cos(2 * math.pi * k / s), math.sin(2 * math.pi * k / s)) for k in range(s)]
+              for s in (3, 4, 5, 6)}
+
 
 def _draw_generative(draw, cx, cy, sz, c1, c2, seed=0, params=None):
     """Geometric-primitive composition matching the 15 base illustration styles."""
     p = {**_GEN_DEFAULTS, **(params or {})}
-    rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
     r = sz // 2
     n = _DENSITY_COUNT.get(p["density"], 35)
     prims = p["primitives"] if isinstance(p["primitives"], list) else [p["primitives"]]
@@ -1437,153 +1596,126 @@ def _draw_generative(draw, cx, cy, sz, c1, c2, seed=0, params=None):
     sym = p["symmetry"]
 
     # ── Generate anchor points based on layout ──
-    anchors = []
     if layout == "horizontal":
-        for i in range(n):
-            x = -r * 0.9 + (i / max(n - 1, 1)) * r * 1.8
-            y = rng.gauss(0, r * 0.12)
-            anchors.append((x, y))
+        xs = np.linspace(-r * 0.9, r * 0.9, n)
+        ys = rng.normal(0, r * 0.12, n)
     elif layout == "vertical":
-        for i in range(n):
-            x = rng.gauss(0, r * 0.12)
-            y = -r * 0.9 + (i / max(n - 1, 1)) * r * 1.8
-            anchors.append((x, y))
+        xs = rng.normal(0, r * 0.12, n)
+        ys = np.linspace(-r * 0.9, r * 0.9, n)
     elif layout == "diagonal":
-        for i in range(n):
-            t = i / max(n - 1, 1)
-            x = -r * 0.8 + t * r * 1.6 + rng.gauss(0, r * 0.06)
-            y = -r * 0.8 + t * r * 1.6 + rng.gauss(0, r * 0.06)
-            anchors.append((x, y))
+        t = np.linspace(-r * 0.8, r * 0.8, n)
+        xs = t + rng.normal(0, r * 0.06, n)
+        ys = t + rng.normal(0, r * 0.06, n)
     elif layout == "scattered":
-        for _ in range(n):
-            x = rng.uniform(-r * 0.85, r * 0.85)
-            y = rng.uniform(-r * 0.85, r * 0.85)
-            anchors.append((x, y))
+        xs = rng.uniform(-r * 0.85, r * 0.85, n)
+        ys = rng.uniform(-r * 0.85, r * 0.85, n)
     elif layout == "layered":
-        n_layers = rng.choice([3, 4, 5])
+        n_layers = int(rng.integers(3, 6))
         per_layer = n // n_layers
-        for li in range(n_layers):
-            y_base = -r * 0.7 + li * (r * 1.4 / (n_layers - 1))
-            for _ in range(per_layer):
-                x = rng.uniform(-r * 0.8, r * 0.8)
-                y = y_base + rng.gauss(0, r * 0.04)
-                anchors.append((x, y))
+        y_base = np.linspace(-r * 0.7, r * 0.7, n_layers)[:, None]
+        xs = rng.uniform(-r * 0.8, r * 0.8, (n_layers, per_layer)).ravel()
+        ys = (y_base + rng.normal(0, r * 0.04, (n_layers, per_layer))).ravel()
     else:  # radial
-        for i in range(n):
-            a = rng.uniform(0, 2 * math.pi)
-            d = rng.uniform(r * 0.05, r * 0.85)
-            anchors.append((d * math.cos(a), d * math.sin(a)))
+        a = rng.uniform(0, 2 * math.pi, n)
+        d = rng.uniform(r * 0.05, r * 0.85, n)
+        xs, ys = d * np.cos(a), d * np.sin(a)
 
     # ── Apply symmetry ──
     if sym == "bilateral":
-        mirrored = [(- x, y) for x, y in anchors]
-        anchors = anchors + mirrored
+        xs, ys = np.concatenate((xs, -xs)), np.concatenate((ys, ys))
     elif sym == "radial":
-        arms = rng.choice([3, 4, 5, 6])
-        base = list(anchors)
-        anchors = []
-        for x, y in base:
-            a0 = math.atan2(y, x)
-            d = math.sqrt(x * x + y * y)
-            for k in range(arms):
-                angle = a0 + k * (2 * math.pi / arms)
-                anchors.append((d * math.cos(angle), d * math.sin(angle)))
-
-    # ── Helper: alpha with edge fade ──
-    def _alpha(x, y, base=180):
-        dist = math.sqrt(x * x + y * y)
-        fade = max(0.15, 1.0 - (dist / r) ** 1.5)
-        return max(40, int(base * fade))
-
-    # ── Draw primitives ──
+        # Each anchor is followed by its copies on the other arms
+        arms = int(rng.integers(3, 7))
+        a = np.arctan2(ys, xs)[:, None] + np.arange(arms) * (2 * math.pi / arms)
+        d = np.hypot(xs, ys)[:, None]
+        xs, ys = (d * np.cos(a)).ravel(), (d * np.sin(a)).ravel()
+    anchors = list(zip(xs.tolist(), ys.tolist()))
+
+    # ── Alpha with edge fade, for all anchors at once ──
+    fade = np.maximum(0.15, 1.0 - (np.sqrt(xs * xs + ys * ys) / r) ** 1.5)
+
+    def _alphas(base):
+        return np.maximum(40, (base * fade).astype(np.int32)).tolist()
+
+    # ── Draw primitives (per-anchor randomness is drawn in one batch per primitive) ──
+    na = len(anchors)
+    spots = list(zip((cx + xs.astype(np.int32)).tolist(), (cy + ys.astype(np.int32)).tolist()))
     for prim in prims:
         if prim == "dots":
-            for x, y in anchors:
-                sx, sy = cx + int(x), cy + int(y)
-                size = rng.uniform(4, 8)
-                a = _alpha(x, y, 200)
-                draw.ellipse([(sx - size, sy - size), (sx + size, sy + size)], fill=(*c1, a))
+            _draw_disks(draw, cx + xs.astype(np.int32), cy + ys.astype(np.int32), rng.uniform(4, 8, na),
+                        [(*c1, a) for a in _alphas(200)])
 
         elif prim == "lines":
-            for i, (x, y) in enumerate(anchors):
-                sx, sy = cx + int(x), cy + int(y)
-                angle = rng.uniform(0, 2 * math.pi)
-                length = rng.uniform(r * 0.08, r * 0.25)
+            angles = rng.uniform(0, 2 * math.pi, na).tolist()
+            lengths = rng.uniform(r * 0.08, r * 0.25, na).tolist()
+            for (sx, sy), angle, length, a in zip(spots, angles, lengths, _alphas(160)):
                 ex = sx + int(length * math.cos(angle))
                 ey = sy + int(length * math.sin(angle))
-                a = _alpha(x, y, 160)
                 draw.line([(sx, sy), (ex, ey)], fill=(*c1, a), width=2)
 
         elif prim == "arcs":
-            for x, y in anchors:
-                sx, sy = cx + int(x), cy + int(y)
-                arc_r = rng.uniform(r * 0.06, r * 0.2)
-                start = rng.uniform(0, 360)
-                span = rng.uniform(60, 200)
-                a = _alpha(x, y, 140)
+            arc_rs = rng.uniform(r * 0.06, r * 0.2, na).tolist()
+            starts = rng.uniform(0, 360, na).tolist()
+            spans = rng.uniform(60, 200, na).tolist()
+            for (sx, sy), arc_r, start, span, a in zip(spots, arc_rs, starts, spans, _alphas(140)):
                 bbox = [sx - arc_r, sy - arc_r, sx + arc_r, sy + arc_r]
                 draw.arc(bbox, start, start + span, fill=(*c1, a), width=2)
 
         elif prim == "ellipses":
-            for x, y in anchors:
-                sx, sy = cx + int(x), cy + int(y)
-                rx = rng.uniform(r * 0.05, r * 0.18)
-                ry = rng.uniform(r * 0.03, r * 0.12)
-                a = _alpha(x, y, 100)
+            rxs = rng.uniform(r * 0.05, r * 0.18, na).tolist()
+            rys = rng.uniform(r * 0.03, r * 0.12, na).tolist()
+            for (sx, sy), rx, ry, a in zip(spots, rxs, rys, _alphas(100)):
                 draw.ellipse([(sx - rx, sy - ry), (sx + rx, sy + ry)], outline=(*c1, a), width=2)
 
         elif prim == "polygons":
-            for x, y in anchors:
-                sx, sy = cx + int(x), cy + int(y)
-                sides = rng.choice([3, 4, 5, 6])
-                pr = rng.uniform(r * 0.04, r * 0.12)
-                rot = rng.uniform(0, 2 * math.pi)
-                pts = [(sx + int(pr * math.cos(rot + 2 * math.pi * k / sides)),
-                        sy + int(pr * math.sin(rot + 2 * math.pi * k / sides)))
-                       for k in range(sides)]
-                a = _alpha(x, y, 130)
-                for k in range(sides):
-                    draw.line([pts[k], pts[(k + 1) % sides]], fill=(*c1, a), width=2)
+            all_sides = rng.integers(3, 7, na).tolist()
+            prs = rng.uniform(r * 0.04, r * 0.12, na).tolist()
+            rots = rng.uniform(0, 2 * math.pi, na).tolist()
+            for (sx, sy), sides, pr, rot, a in zip(spots, all_sides, prs, rots, _alphas(130)):
+                # Rotate the cached unit polygon instead of evaluating sin/cos per vertex
+                pc, ps = pr * math.cos(rot), pr * math.sin(rot)
+                pts = [(sx + int(ux * pc - uy * ps), sy + int(ux * ps + uy * pc))
+                       for ux, uy in _POLY_UNIT[sides]]
+                draw.line(pts + pts[:1], fill=(*c1, a), width=2, joint="curve")
 
         elif prim == "curves":
             # Smooth curves through anchor subsets
-            sorted_a = sorted(anchors, key=lambda p: p[0] if layout == "horizontal"
-                              else p[1] if layout == "vertical" else math.atan2(p[1], p[0]))
-            chunk = max(4, len(sorted_a) // 3)
-            for start_idx in range(0, len(sorted_a), chunk):
-                subset = sorted_a[start_idx:start_idx + chunk]
-                if len(subset) < 3:
+            key = xs if layout == "horizontal" else ys if layout == "vertical" else np.arctan2(ys, xs)
+            order = np.argsort(key, kind="stable").tolist()
+            alphas = _alphas(150)
+            sorted_spots = [spots[i] for i in order]
+            sorted_alphas = [alphas[i] for i in order]
+            chunk = max(4, na // 3)
+            for start_idx in range(0, na, chunk):
+                end_idx = min(start_idx + chunk, na)
+                if end_idx - start_idx < 3:
                     continue
-                for j in range(1, len(subset)):
-                    x0, y0 = subset[j - 1]
-                    x1, y1 = subset[j]
-                    a = _alpha(x0, y0, 150)
-                    draw.line([(cx + int(x0), cy + int(y0)),
-                               (cx + int(x1), cy + int(y1))], fill=(*c1, a), width=2)
+                # Segment j fades with its start point; equal-alpha runs share one polyline
+                _draw_path(draw, sorted_spots[start_idx:end_idx], c1, sorted_alphas[start_idx:end_idx - 1], 2)
 
         elif prim == "grid":
             # Small local grid patterns at some anchor positions
-            used = anchors[:min(8, len(anchors))]
-            for x, y in used:
-                sx, sy = cx + int(x), cy + int(y)
+            for (sx, sy), a in zip(spots[:8], _alphas(110)):
                 cell = rng.uniform(r * 0.03, r * 0.06)
-                rows, cols = rng.choice([3, 4]), rng.choice([3, 4])
-                a = _alpha(x, y, 110)
+                rows, cols = rng.integers(3, 5, 2).tolist()
+                jitter = iter(rng.integers(-30, 21, rows * cols).tolist())
                 for row in range(rows):
                     for col in range(cols):
                         gx = sx + int((col - cols / 2) * cell)
                         gy = sy + int((row - rows / 2) * cell)
                         draw.rectangle([(gx, gy), (gx + int(cell * 0.7), gy + int(cell * 0.7))],
-                                       fill=(*c1, a + rng.randint(-30, 20)))
+                                       fill=(*c1, a + next(jitter)))
 
     # ── Optional: light connections between nearby anchors ──
     if len(prims) > 1 or rng.random() < 0.4:
-        pts = [(cx + int(x), cy + int(y)) for x, y in anchors]
+        pts = spots
+        max_d2 = (r * 0.35) ** 2
         for i in range(min(len(pts), 60)):
+            xi, yi = pts[i]
             for j in range(i + 1, min(i + 4, len(pts))):
-                d = math.dist(pts[i], pts[j])
-                if d < r * 0.35:
-                    a = max(20, int(50 - d * 0.3))
+                d2 = (pts[j][0] - xi) ** 2 + (pts[j][1] - yi) ** 2
+                if d2 < max_d2:
+                    a = max(20, int(50 - math.sqrt(d2) * 0.3))
                     draw.line([pts[i], pts[j]], fill=(*c2, a), width=1)
 
 
@@ -1676,19 +1808,38 @@ def fetch_description(url):
     return None
 
 
+# One encoder reused across cards. Level L gives a smaller matrix than M; the
+# code is printed large on a clean background, so it needs little redundancy.
+_QR = qrcode.QRCode(version=None, error_correction=qrcode.constants.ERROR_CORRECT_L, border=2)  # box_size set per code
+
+@functools.lru_cache(maxsize=32)
 def _make_qr(url, fill, bg):
-    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=10, border=2)
+    """QR image for url; repeated slugs in a batch reuse it, so callers must not modify it."""
+    qr = _QR
+    qr.clear()
+    qr.version = None  # otherwise best_fit starts from the previous card's version
     qr.add_data(url)
     qr.make(fit=True)
-    return qr.make_image(fill_color=fill, back_color=bg).convert("RGBA").resize((QR_SIZE, QR_SIZE), Image.LANCZOS)
-
-
-def _draw_gradient_bg(img):
-    d = ImageDraw.Draw(img)
-    for y in range(CARD_H):
-        t = y / CARD_H
-        d.line([(0, y), (CARD_W, y)],
-               fill=(int(30 + 30 * t), int(30 + 25 * t), int(75 + 55 * t)))
+    # Largest whole-pixel module that fits, centred on a bg square, so no resample blur
+    side = qr.modules_count + 2 * qr.border
+    qr.box_size = max(1, QR_SIZE // side)
+    img = qr.make_image(fill_color=fill, back_color=bg).convert("RGBA")
+    if side > QR_SIZE:  # too many modules even at 1 px each
+        return img.resize((QR_SIZE, QR_SIZE), Image.LANCZOS)
+    out = Image.new("RGBA", (QR_SIZE, QR_SIZE), bg)
+    out.paste(img, ((QR_SIZE - img.width) // 2,) * 2)
+    return out
+
+
+@functools.lru_cache(maxsize=4)
+def _gradient_bg(w, h, top_rgb, bot_rgb):
+    """Vertical linear gradient, built once per size/colors; callers must .copy() it."""
+    t = (np.arange(h) / h)[:, None]
+    top = np.array(top_rgb)
+    column = np.full((h, 1, 4), 255, np.uint8)
+    column[:, 0, :3] = top + (np.array(bot_rgb) - top) * t
+    # Stretch the one-pixel column sideways; cheaper than filling w*h pixels in NumPy
+    return Image.fromarray(column, "RGBA").resize((w, h), Image.NEAREST)
 
 
 # ── Main Generator ──────────────────────────────────────────
@@ -1706,20 +1857,19 @@ def generate_card(keyword, description=None, style_name="light", output=None, ut
     if utm:
         qr_url = f"{url}{'&' if '?' in url else '?'}utm_source={utm}&utm_medium=wordcard&utm_campaign=comment_marketing"
 
-    cat = illust_type or guess_category(slug)
     # If no category matched and no explicit type, use generative mode
-    if cat == "dots" and illust_type is None and guess_category(slug) == "dots":
-        matched = any(kw in slug.lower() for kws in CATEGORY_KEYWORDS.values() for kw in kws)
-        if not matched:
-            cat = "generative"
+    cat = illust_type or _match_category(slug) or "generative"
     illust_fn = ILLUST_FUNCS.get(cat, _draw_dots)
     s = STYLES.get(style_name, STYLES["light"])
-    kw_seed = hash(slug) & 0xFFFFFF  # 改动 5: keyword-hash seed
+    # 改动 5: keyword-hash seed. crc32 rather than hash(): str hashes are salted per
+    # process, so batch workers (and reruns) would draw a different card for the same slug
+    kw_seed = zlib.crc32(slug.encode()) & 0xFFFFFF
 
     # ── Create image ──
-    img = Image.new("RGBA", (CARD_W, CARD_H), s["bg"] or (0, 0, 0, 0))
     if style_name == "gradient":
-        _draw_gradient_bg(img)
+        img = _gradient_bg(CARD_W, CARD_H, (30, 30, 75), (60, 55, 130)).copy()
+    else:
+        img = Image.new("RGBA", (CARD_W, CARD_H), s["bg"] or (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
 
     # ── Illustration panel bg (light mode gets a subtle rounded rect) ──
@@ -1729,6 +1879,8 @@ def generate_card(keyword, description=None, style_name="light", output=None, ut
     # ── Illustration (right side) ──
     illust_cx = CARD_W - 315
     illust_cy = (40 + CARD_H - PAD - 60) // 2 + 30
+    # Drawn straight onto the card: ImageDraw writes RGBA fills without blending,
+    # so there is no per-call compositing to batch into one layer
     if cat != "none":
         if cat == "generative":
             illust_fn(draw, illust_cx, illust_cy, 440, s["illust"], s["illust_dim"], seed=kw_seed, params=gen_params)
@@ -1762,8 +1914,7 @@ def generate_card(keyword, description=None, style_name="light", output=None, ut
     else:
         url_font = _font(24, "mono")
         full_path = f"bohrium.com/en/sciencepedia/feynman/keyword/{slug}"
-        url_lines = textwrap.wrap(full_path, width=30)
-        for i, uline in enumerate(url_lines[:3]):
+        for i, uline in enumerate(_wrapper(30).wrap(full_path)[:3]):
             draw.text((url_x, qr_y + 40 + i * 44), uline, font=url_font, fill=s["url"])
 
     # ── Brand (bottom-right, centered in illust panel) — 用标题字体 ──
@@ -1788,7 +1939,7 @@ def generate_card(keyword, description=None, style_name="light", output=None, ut
 
 
 # ── CLI ─────────────────────────────────────────────────────
-def main():
+def main(argv=None):
     p = argparse.ArgumentParser(description="Generate SciencePedia word cards with illustrations")
     p.add_argument("keyword", nargs="?", help="URL or keyword slug")
     p.add_argument("-o", "--output", help="Output path")
@@ -1798,8 +1949,9 @@ def main():
     p.add_argument("--illust", choices=list(ILLUST_FUNCS.keys()) + ["none"], help="Override illustration type")
     p.add_argument("--gen-params", type=str, help='JSON string of generative params, e.g. \'{"motion":"spiral","force":"vortex","trail":true}\'')
     p.add_argument("--batch", action="store_true", help="Read keywords from stdin, one per line")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Parallel workers for --batch (default: CPU count)")
     p.add_argument("--qr-label", choices=["url", "scan"], default="url", help="QR label style: 'url' (full path) or 'scan' (Scan to Explore)")
-    args = p.parse_args()
+    args = p.parse_args(argv)
 
     gp = json.loads(args.gen_params) if args.gen_params else None
     # If gen_params provided, auto-set illust to generative
@@ -1807,10 +1959,18 @@ def main():
         args.illust = "generative"
 
     if args.batch:
-        for line in sys.stdin:
-            kw = line.strip()
-            if kw:
-                generate_card(kw, style_name=args.style, utm=args.utm, illust_type=args.illust, qr_label=args.qr_label, gen_params=gp)
+        keywords = [line.strip() for line in sys.stdin if line.strip()]
+        render = functools.partial(generate_card, style_name=args.style, utm=args.utm, illust_type=args.illust,
+                                   qr_label=args.qr_label, gen_params=gp)
+        jobs = max(1, min(args.jobs, len(keywords)))
+        if jobs > 1:
+            # Cards are independent; fonts, regexes etc. are module-level and inherited by the workers
+            with multiprocessing.Pool(jobs) as pool:
+                for _ in pool.imap_unordered(render, keywords):
+                    pass
+        else:
+            for kw in keywords:
+                render(kw)
     elif args.keyword:
         generate_card(args.keyword, description=args.description, style_name=args.style,
                       output=args.output, utm=args.utm, illust_type=args.illust, qr_label=args.qr_label, gen_params=gp)
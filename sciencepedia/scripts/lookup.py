@@ -10,7 +10,7 @@ Usage:
 Searches 145K+ SciencePedia entries using layered matching:
   Layer 1: Exact match
   Layer 2: Substring / token overlap
-  Layer 3: Fuzzy match (difflib)
+  Layer 3: Fuzzy match (rapidfuzz if installed, else difflib)
 """
 
 import sys
@@ -18,9 +18,20 @@ import os
 import json
 import difflib
 import re
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 
+try:
+    from rapidfuzz import fuzz, process  # optional: C++ fuzzy matching for Layer 5
+except ImportError:
+    process = None
+
+try:
+    import orjson  # optional: parses index.json several times faster than json
+except ImportError:
+    orjson = None
+
 # ── Config ──────────────────────────────────────────────────────────────────
 
 BASE_URL = "https://www.bohrium.com/en/sciencepedia/feynman/keyword/"
@@ -31,28 +42,36 @@ SITEMAP_URLS = [
 DATA_DIR = Path(__file__).parent.parent / "data"
 SLUGS_FILE = DATA_DIR / "slugs.txt"
 INDEX_FILE = DATA_DIR / "index.json"  # precomputed search index
+SLUG_RE = re.compile(r'feynman/keyword/([^<]+)')
 
 # ── Data Loading ────────────────────────────────────────────────────────────
 
+def _fetch_sitemap(url):
+    """Fetch one sitemap; returns its XML text, or None on failure."""
+    import urllib.request  # only --refresh needs it; lookups skip its ~40 ms import
+    try:
+        with urllib.request.urlopen(url, timeout=60) as resp:
+            return resp.read().decode("utf-8")
+    except Exception as e:
+        print(f"  WARN: failed to fetch {url}: {e}", file=sys.stderr)
+        return None
+
+
 def download_slugs():
-    """Download all slugs from sitemaps via curl + grep."""
+    """Download all slugs from the sitemaps, fetched concurrently."""
     print("Downloading sitemaps...", file=sys.stderr)
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     all_slugs = []
 
-    for url in SITEMAP_URLS:
-        try:
-            result = subprocess.run(
-                ["curl", "-s", url],
-                capture_output=True, text=True, timeout=60
-            )
-            if result.returncode == 0:
-                # extract slugs from XML
-                slugs = re.findall(r'feynman/keyword/([^<]+)', result.stdout)
-                all_slugs.extend(slugs)
-                print(f"  {url.split('_')[-1]}: {len(slugs)} entries", file=sys.stderr)
-        except Exception as e:
-            print(f"  WARN: failed to fetch {url}: {e}", file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=len(SITEMAP_URLS)) as ex:
+        pages = list(ex.map(_fetch_sitemap, SITEMAP_URLS))
+
+    for url, xml in zip(SITEMAP_URLS, pages):
+        if xml is not None:
+            # extract slugs from XML
+            slugs = SLUG_RE.findall(xml)
+            all_slugs.extend(slugs)
+            print(f"  {url.split('_')[-1]}: {len(slugs)} entries", file=sys.stderr)
 
     if all_slugs:
         SLUGS_FILE.write_text("\n".join(all_slugs) + "\n")
@@ -65,6 +84,69 @@ def download_slugs():
     return all_slugs
 
 
+class SearchIndex:
+    """The slug → {"name", "tokens"} index plus column views for scanning.
+
+    Lookups go through the entries dict; the scanning layers walk parallel
+    lists in entry order, built on first use so exact hits never pay for them.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __contains__(self, slug):
+        return slug in self.entries
+
+    def __getitem__(self, slug):
+        return self.entries[slug]
+
+    def __len__(self):
+        return len(self.entries)
+
+    @cached_property
+    def slugs(self):
+        return list(self.entries)
+
+    @cached_property
+    def names(self):
+        return [entry["name"] for entry in self.entries.values()]
+
+    @cached_property
+    def names_lower(self):
+        return [name.lower() for name in self.names]
+
+    @cached_property
+    def name_to_slug(self):
+        # Duplicate names map to their last entry, as dict(zip(...)) always did
+        return dict(zip(self.names_lower, self.slugs))
+
+    @cached_property
+    def corpus(self):
+        # Names never contain a newline, so it cleanly separates them
+        return "\n".join(self.names_lower)
+
+    def containing(self, text):
+        """Indices of the lowercased names that contain text, in entry order.
+
+        One str.find chain over the joined corpus; the entry index is
+        tracked by counting the newlines passed since the previous hit.
+        """
+        if not text or "\n" in text:
+            return [i for i, name in enumerate(self.names_lower) if text in name]
+        corpus = self.corpus
+        hits = []
+        i, last = 0, 0
+        pos = corpus.find(text)
+        while pos != -1:
+            i += corpus.count("\n", last, pos)
+            hits.append(i)
+            last = corpus.find("\n", pos)  # end of this name; resume in the next one
+            if last == -1:
+                break
+            pos = corpus.find(text, last)
+        return hits
+
+
 def build_index(slugs):
     """Build a search index: slug → human-readable name + tokens."""
     index = {}
@@ -81,14 +163,20 @@ def build_index(slugs):
         }
 
     INDEX_FILE.write_text(json.dumps(index, ensure_ascii=False))
-    return index
+    return SearchIndex(index)
+
+
+def _read_index():
+    if orjson is not None:
+        return SearchIndex(orjson.loads(INDEX_FILE.read_bytes()))
+    return SearchIndex(json.loads(INDEX_FILE.read_text()))
 
 
 def load_index():
     """Load or build the search index."""
     # try precomputed index first
     if INDEX_FILE.exists():
-        return json.loads(INDEX_FILE.read_text())
+        return _read_index()
 
     # fallback to slugs file
     if SLUGS_FILE.exists():
@@ -98,8 +186,8 @@ def load_index():
     # nothing cached — download
     slugs = download_slugs()
     if not slugs:
-        return {}
-    return json.loads(INDEX_FILE.read_text())
+        return SearchIndex({})
+    return _read_index()
 
 
 # ── Search Engine ───────────────────────────────────────────────────────────
@@ -111,7 +199,7 @@ def search(query, index, top_n=3):
       2. Exact name match (case-insensitive)
       3. Substring match (query in name or name in query)
       4. Token overlap (scored by % of query tokens found)
-      5. Fuzzy match (difflib on human-readable names)
+      5. Fuzzy match (rapidfuzz or difflib on human-readable names)
 
     Returns list of (slug, name, url, match_type, score).
     """
@@ -131,10 +219,14 @@ def search(query, index, top_n=3):
         results.append((query_slug, entry["name"], "EXACT", 1.0))
         return _format_results(results[:top_n])
 
+    slugs, names, names_lower = index.slugs, index.names, index.names_lower
+    # Names containing the query: an exact name is one of them, and Layer 3 reuses the list
+    contains = index.containing(query_clean)
+
     # ── Layer 2: Exact name match (case-insensitive) ──
-    for slug, entry in index.items():
-        if entry["name"].lower() == query_clean:
-            results.append((slug, entry["name"], "EXACT", 1.0))
+    for i in contains:
+        if names_lower[i] == query_clean:
+            results.append((slugs[i], names[i], "EXACT", 1.0))
     if results:
         return _format_results(results[:top_n])
 
@@ -154,31 +246,43 @@ def search(query, index, top_n=3):
         return _format_results(results[:top_n])
 
     # ── Layer 3: Substring match ──
+    # (entry index, match type, score); ties keep entry order
     substring_hits = []
-    for slug, entry in index.items():
-        if len(slug) < MIN_SLUG_LEN:
+    for i in contains:
+        if len(slugs[i]) < MIN_SLUG_LEN:
             continue  # skip tiny slugs like "n", "gl", "1"
-        name_lower = entry["name"].lower()
-        if query_clean in name_lower:
-            # prefer shorter names (more specific matches)
-            score = len(query_clean) / max(len(name_lower), 1)
-            substring_hits.append((slug, entry["name"], "CONTAINS", score))
-        elif len(name_lower) >= MIN_SLUG_LEN and name_lower in query_clean:
+        # prefer shorter names (more specific matches)
+        score = len(query_clean) / max(len(names_lower[i]), 1)
+        substring_hits.append((i, "CONTAINS", score))
+    # A name both containing and contained in the query would equal it, and
+    # Layer 2 has already returned those, so the two passes never overlap
+    for i, name_lower in enumerate(names_lower):
+        if name_lower in query_clean and len(name_lower) >= MIN_SLUG_LEN:
+            if len(slugs[i]) < MIN_SLUG_LEN:
+                continue
             score = len(name_lower) / max(len(query_clean), 1)
             # only keep if the matched name is meaningfully long
             if score >= 0.3:
-                substring_hits.append((slug, entry["name"], "CONTAINED_IN", score))
+                substring_hits.append((i, "CONTAINED_IN", score))
 
     if substring_hits:
-        substring_hits.sort(key=lambda x: -x[3])
-        return _format_results(substring_hits[:top_n])
+        substring_hits.sort(key=lambda x: (-x[2], x[0]))
+        return _format_results([(slugs[i], names[i], match_type, score)
+                                for i, match_type, score in substring_hits[:top_n]])
 
     # ── Layer 4: Token overlap ──
     token_hits = []
     if query_tokens:
-        for slug, entry in index.items():
+        # An entry's tokens come from its lowercased name, so only names that
+        # contain a query token as a substring can overlap; score just those
+        candidates = set()
+        for tok in query_tokens:
+            candidates.update(index.containing(tok))
+        for i in sorted(candidates):
+            slug = slugs[i]
             if len(slug) < MIN_SLUG_LEN:
                 continue
+            entry = index[slug]
             entry_tokens = set(entry["tokens"])
             overlap = query_tokens & entry_tokens
             if overlap:
@@ -193,25 +297,31 @@ def search(query, index, top_n=3):
         token_hits.sort(key=lambda x: -x[3])
         return _format_results(token_hits[:top_n])
 
-    # ── Layer 5: Fuzzy match (difflib) ──
-    all_names = {slug: entry["name"] for slug, entry in index.items()}
-    # get close matches on human-readable names
-    close = difflib.get_close_matches(
-        query_clean,
-        [n.lower() for n in all_names.values()],
-        n=top_n,
-        cutoff=0.5
-    )
-
-    if close:
-        # map back to slugs
-        name_to_slug = {entry["name"].lower(): slug for slug, entry in index.items()}
-        for match_name in close:
-            slug = name_to_slug.get(match_name)
-            if slug:
-                score = difflib.SequenceMatcher(None, query_clean, match_name).ratio()
-                results.append((slug, index[slug]["name"], "FUZZY", round(score, 3)))
-        return _format_results(results[:top_n])
+    # ── Layer 5: Fuzzy match (rapidfuzz if installed, else difflib) ──
+    if process is not None:
+        # fuzz.ratio is the Indel-distance counterpart of difflib's ratio, on a 0-100 scale
+        for _, score, i in process.extract(query_clean, names_lower, scorer=fuzz.ratio,
+                                           limit=top_n, score_cutoff=50):
+            results.append((slugs[i], names[i], "FUZZY", round(score / 100, 3)))
+        if results:
+            return _format_results(results)
+    else:
+        # get close matches on human-readable names
+        close = difflib.get_close_matches(
+            query_clean,
+            names_lower,
+            n=top_n,
+            cutoff=0.5
+        )
+
+        if close:
+            # map back to slugs; the map is built once per index, not per query
+            for match_name in close:
+                slug = index.name_to_slug.get(match_name)
+                if slug:
+                    score = difflib.SequenceMatcher(None, query_clean, match_name).ratio()
+                    results.append((slug, index[slug]["name"], "FUZZY", round(score, 3)))
+            return _format_results(results[:top_n])
 
     return [{"query": query, "status": "NOT_FOUND", "suggestion": "Try synonyms or broader terms."}]
 